@@ -3,24 +3,37 @@ Advent of Code 2025 - Day 1: Secret Entrance
 """
 
 import os
+import random
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.backend import np, register
 from utils.input_reader import read_input
+from utils.parallel import default_jobs, map_reduce
+
+
+# Below this many rotations the parallel scan is not worth the process pool
+PARALLEL_MIN_ROTATIONS = 200_000
 
 
 def solve_part1(rotations):
     """
     Part 1: Count how many times the dial points at 0 after any rotation.
     
+    With more than one job configured (run.py --jobs N), large inputs are
+    handed to the parallel prefix scan instead.
+    
     Args:
         rotations: List of rotation instructions (e.g., ["L68", "R48"])
     
     Returns:
         Number of times the dial points at 0 after a rotation completes
     """
+    if default_jobs() > 1 and len(rotations) >= PARALLEL_MIN_ROTATIONS:
+        return solve_parallel(rotations)[0]
+    
     dial_position = 50  # Starting position
     zero_count = 0
     
@@ -43,12 +56,23 @@ def solve_part2(rotations):
     """
     Part 2: Count all times the dial passes through 0 during any click.
     
+    Instead of simulating each click, the zeros passed by one rotation are
+    counted arithmetically: they are the multiples of 100 among the unwrapped
+    positions visited, which floor division gives in O(1). The total cost is
+    O(number of rotations), independent of the rotation distances.
+    
+    With more than one job configured, large inputs are handed to the
+    parallel prefix scan instead.
+    
     Args:
         rotations: List of rotation instructions (e.g., ["L68", "R48"])
     
     Returns:
         Number of times the dial points at 0 during any click
     """
+    if default_jobs() > 1 and len(rotations) >= PARALLEL_MIN_ROTATIONS:
+        return solve_parallel(rotations)[1]
+    
     dial_position = 50  # Starting position
     zero_count = 0
     
@@ -56,21 +80,403 @@ def solve_part2(rotations):
         direction = rotation[0]  # 'L' or 'R'
         distance = int(rotation[1:])  # The number of clicks
         
-        # Count every click that passes through 0
+        # Count every click that lands on 0
         if direction == 'L':
-            for _ in range(distance):
-                dial_position = (dial_position - 1) % 100
-                if dial_position == 0:
-                    zero_count += 1
+            # Clicks visit dial_position - 1 down to dial_position - distance
+            zero_count += (dial_position - 1) // 100 - (dial_position - distance - 1) // 100
+            dial_position = (dial_position - distance) % 100
         else:  # direction == 'R'
-            for _ in range(distance):
-                dial_position = (dial_position + 1) % 100
-                if dial_position == 0:
-                    zero_count += 1
+            # Clicks visit dial_position + 1 up to dial_position + distance
+            zero_count += (dial_position + distance) // 100 - dial_position // 100
+            dial_position = (dial_position + distance) % 100
     
     return zero_count
 
 
+class Dial:
+    """
+    Streaming dial: feed rotations one at a time and read both counts.
+    
+    Each rotation is an O(1) update with the same floor-division formulas
+    as solve_part2, and only the current position and counters are kept,
+    so memory stays flat no matter how many rotations are fed.
+    
+    Usage:
+        dial = Dial()
+        dial.feed_many(["L68", "L30"])
+        dial.end_zeros, dial.click_zeros
+    """
+    
+    __slots__ = ('position', 'end_zeros', 'click_zeros', 'rotations')
+    
+    def __init__(self, position=50):
+        self.position = position
+        self.end_zeros = 0    # Part 1: rotations that ended on 0
+        self.click_zeros = 0  # Part 2: clicks that landed on 0
+        self.rotations = 0
+    
+    def feed(self, rotation):
+        """
+        Apply one rotation instruction (e.g., "L68").
+        
+        Args:
+            rotation: Rotation instruction
+        """
+        distance = int(rotation[1:])
+        position = self.position
+        
+        if rotation[0] == 'L':
+            self.click_zeros += (position - 1) // 100 - (position - distance - 1) // 100
+            position = (position - distance) % 100
+        else:
+            self.click_zeros += (position + distance) // 100 - position // 100
+            position = (position + distance) % 100
+        
+        if position == 0:
+            self.end_zeros += 1
+        self.position = position
+        self.rotations += 1
+    
+    def feed_many(self, rotations):
+        """
+        Apply rotations from any iterable, skipping blank lines.
+        
+        Args:
+            rotations: Iterable of rotation instructions (e.g., a file object)
+        
+        Returns:
+            self, for chaining
+        """
+        for rotation in rotations:
+            rotation = rotation.strip()
+            if rotation:
+                self.feed(rotation)
+        return self
+    
+    def snapshot(self):
+        """
+        Capture the dial state.
+        
+        Returns:
+            Dict with position, end_zeros, click_zeros and rotations
+        """
+        return {
+            'position': self.position,
+            'end_zeros': self.end_zeros,
+            'click_zeros': self.click_zeros,
+            'rotations': self.rotations,
+        }
+    
+    @classmethod
+    def restore(cls, state):
+        """
+        Rebuild a dial from a snapshot() result.
+        
+        Args:
+            state: Dict returned by snapshot()
+        
+        Returns:
+            New Dial with that state
+        """
+        dial = cls(state['position'])
+        dial.end_zeros = state['end_zeros']
+        dial.click_zeros = state['click_zeros']
+        dial.rotations = state['rotations']
+        return dial
+
+
+def stream_main(lines=None, every=1):
+    """
+    Read rotations from stdin and print running counts as they arrive.
+    
+    Usage: python day01/solution.py --stream [--every N] < rotations.txt
+    
+    Args:
+        lines: Iterable of rotation lines (default: sys.stdin)
+        every: Print the counts after every N rotations (default 1)
+    """
+    dial = Dial()
+    for line in sys.stdin if lines is None else lines:
+        rotation = line.strip()
+        if not rotation:
+            continue
+        dial.feed(rotation)
+        if dial.rotations % every == 0:
+            print(f"{rotation:>8}  position {dial.position:>2}  "
+                  f"part1 {dial.end_zeros}  part2 {dial.click_zeros}", flush=True)
+    
+    print(f"Total after {dial.rotations} rotations: "
+          f"part1 {dial.end_zeros}  part2 {dial.click_zeros}")
+
+
+def scan_chunk(rotations, modulus=100):
+    """
+    Summarise a run of rotations for every possible entry position at once.
+    
+    Let S be the offset from the entry position e, written S = q*m + r.
+    Then floor((e + S) / m) = q + [e >= m - r], so every crossing count from
+    solve_part2 splits into a part independent of e plus +/-1 indicators
+    "e >= threshold". Those are collected in a difference array and turned
+    into per-entry counts with one prefix sum: O(len(rotations) + m) total.
+    
+    Args:
+        rotations: List of rotation instructions
+        modulus: Number of dial positions (default 100)
+    
+    Returns:
+        Tuple of (net offset mod modulus, part 1 hits per entry position,
+        part 2 hits per entry position)
+    """
+    end_hits = [0] * modulus
+    thresholds = [0] * (modulus + 1)
+    base = 0
+    offset = 0
+    
+    for rotation in rotations:
+        distance = int(rotation[1:])
+        if rotation[0] == 'L':
+            # (e + S - 1) // m before minus after the rotation
+            laps_before, rest_before = divmod(offset - 1, modulus)
+            offset -= distance
+            laps_after, rest_after = divmod(offset - 1, modulus)
+            base += laps_before - laps_after
+            thresholds[modulus - rest_before] += 1
+            thresholds[modulus - rest_after] -= 1
+        else:
+            # (e + S) // m after minus before the rotation
+            laps_before, rest_before = divmod(offset, modulus)
+            offset += distance
+            laps_after, rest_after = divmod(offset, modulus)
+            base += laps_after - laps_before
+            thresholds[modulus - rest_after] += 1
+            thresholds[modulus - rest_before] -= 1
+        
+        # Ends on 0 exactly when e == -S (mod m)
+        end_hits[-offset % modulus] += 1
+    
+    click_hits = []
+    running = base
+    for entry in range(modulus):
+        running += thresholds[entry]
+        click_hits.append(running)
+    
+    return offset % modulus, end_hits, click_hits
+
+
+def combine_scans(first, second):
+    """
+    Stitch two chunk summaries from scan_chunk() into one.
+    
+    The second chunk is entered at the position the first one leaves the
+    dial in, so its tables are rotated by the first chunk's net offset.
+    The operation is associative, which is what lets chunks be scanned in
+    parallel and combined in order afterwards.
+    """
+    offset, end_hits, click_hits = first
+    modulus = len(end_hits)
+    offset2, end_hits2, click_hits2 = second
+    return (
+        (offset + offset2) % modulus,
+        [end_hits[e] + end_hits2[(e + offset) % modulus] for e in range(modulus)],
+        [click_hits[e] + click_hits2[(e + offset) % modulus] for e in range(modulus)],
+    )
+
+
+def counts_for_all_starts(rotations, modulus=100):
+    """
+    Part 1 and Part 2 counts for every starting position in one pass.
+    
+    Uses the per-residue counting of scan_chunk(), so a sweep over all
+    starting positions costs a single pass over the rotations instead of
+    one full run per position.
+    
+    Args:
+        rotations: List of rotation instructions
+        modulus: Number of dial positions (default 100)
+    
+    Returns:
+        List indexed by starting position of (part 1, part 2) tuples
+    """
+    if modulus < 1:
+        raise ValueError(f"modulus must be positive, got {modulus}")
+    
+    _, end_hits, click_hits = scan_chunk(rotations, modulus)
+    return list(zip(end_hits, click_hits))
+
+
+def solve_parallel(rotations, jobs=None, start=50):
+    """
+    Solve both parts with a chunked prefix scan over worker processes.
+    
+    The rotations are split into chunks; each worker summarises its chunk
+    for all 100 entry positions (scan_chunk), and the summaries are combined
+    in order with the carried dial position (combine_scans).
+    
+    Args:
+        rotations: List of rotation instructions
+        jobs: Worker processes (default: utils.parallel.default_jobs())
+        start: Starting dial position (default 50)
+    
+    Returns:
+        Tuple of (part 1 answer, part 2 answer)
+    """
+    jobs = default_jobs() if jobs is None else jobs
+    size = max(1, -(-len(rotations) // (jobs * 4)))
+    chunks = [rotations[i:i + size] for i in range(0, len(rotations), size)]
+    
+    identity = (0, [0] * 100, [0] * 100)
+    _, end_hits, click_hits = map_reduce(chunks, scan_chunk, reducer=combine_scans,
+                                         initial=identity, jobs=jobs,
+                                         chunksize=1, serial_below=2)
+    return end_hits[start], click_hits[start]
+
+
+def solve_both(rotations):
+    """
+    Solve both parts, running the parallel prefix scan at most once.
+    
+    One scan yields both answers, so when solve_part1 and solve_part2 would
+    each hand a large input to solve_parallel, it is run once here instead.
+    Otherwise the two parts are solved as usual.
+    
+    Args:
+        rotations: List of rotation instructions
+    
+    Returns:
+        Tuple of (part 1 answer, part 2 answer)
+    """
+    if default_jobs() > 1 and len(rotations) >= PARALLEL_MIN_ROTATIONS:
+        return solve_parallel(rotations)
+    return solve_part1(rotations), solve_part2(rotations)
+
+
+def parse_deltas_numpy(rotations):
+    """
+    Parse rotations into a signed int64 delta array without a Python loop.
+    
+    The instructions are viewed as one uint8 buffer. Distance digits are
+    right-aligned at each newline and accumulated column by column, so the
+    whole input is parsed in a handful of vectorised passes.
+    
+    Args:
+        rotations: List of rotation instructions, or the raw input as bytes
+    
+    Returns:
+        int64 array with +distance for R and -distance for L
+    """
+    if isinstance(rotations, (bytes, bytearray)):
+        text = bytes(rotations).strip()
+    else:
+        text = '\n'.join(rotations).encode()
+    if not text:
+        return np.zeros(0, dtype=np.int64)
+    
+    buf = np.frombuffer(text + b'\n', dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord('\n'))
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts - 1  # digits after the direction letter
+    
+    # Left-pad the buffer so every right-aligned column index is valid
+    width = int(lengths.max())
+    padded = np.concatenate((np.zeros(width, dtype=np.uint8), buf))
+    
+    deltas = np.zeros(len(ends), dtype=np.int64)
+    for column in range(width):
+        digits = padded[ends + column].astype(np.int64) - ord('0')
+        digits *= lengths >= width - column  # zero where the line is shorter
+        deltas *= 10
+        deltas += digits
+    
+    np.negative(deltas, out=deltas, where=buf[starts] == ord('L'))
+    return deltas
+
+
+def count_zeros_numpy(deltas, start=50):
+    """
+    Count both kinds of zero hits for a whole delta array at once.
+    
+    With unwrapped positions P (P[0] = start), floor division gives
+    q = P // 100 and z = (P % 100 == 0). A right rotation passes
+    q[i+1] - q[i] zeros; a left one passes q[i] - q[i+1] - z[i] + z[i+1]
+    (the same formulas as solve_part2), so Part 2 is sum(|diff(q)|) plus the
+    z corrections for left rotations, and Part 1 is sum(z[1:]).
+    
+    Args:
+        deltas: Signed distances from parse_deltas_numpy()
+        start: Starting dial position (default 50)
+    
+    Returns:
+        Tuple of (part 1 count, part 2 count)
+    """
+    positions = np.empty(len(deltas) + 1, dtype=np.int64)
+    positions[0] = 0
+    np.cumsum(deltas, out=positions[1:])
+    positions += start
+    
+    laps, offsets = np.divmod(positions, 100)
+    at_zero = offsets == 0
+    left = deltas < 0
+    
+    part1 = int(np.count_nonzero(at_zero[1:]))
+    part2 = (int(np.abs(np.diff(laps)).sum())
+             + int(np.count_nonzero(at_zero[1:] & left))
+             - int(np.count_nonzero(at_zero[:-1] & left)))
+    return part1, part2
+
+
+@register('numpy', 'part1')
+def solve_part1_numpy(rotations):
+    """
+    Part 1 (NumPy backend): prefix sums over the signed rotation distances.
+    
+    Args:
+        rotations: List of rotation instructions, or the raw input as bytes
+    
+    Returns:
+        Number of times the dial points at 0 after a rotation completes
+    """
+    return count_zeros_numpy(parse_deltas_numpy(rotations))[0]
+
+
+@register('numpy', 'part2')
+def solve_part2_numpy(rotations):
+    """
+    Part 2 (NumPy backend): floor-division crossing counts on the prefix sums.
+    
+    Args:
+        rotations: List of rotation instructions, or the raw input as bytes
+    
+    Returns:
+        Number of times the dial points at 0 during any click
+    """
+    return count_zeros_numpy(parse_deltas_numpy(rotations))[1]
+
+
+def generate(size, seed=0):
+    """
+    Generate random rotation instructions for benchmarking.
+    
+    Args:
+        size: Number of rotations
+        seed: Random seed
+    
+    Returns:
+        List of rotation instructions
+    """
+    rng = random.Random(seed)
+    return [f"{rng.choice('LR')}{rng.randint(1, 999)}" for _ in range(size)]
+
+
+def bench(rotations):
+    """Benchmark hook for `python run.py 1 --bench`."""
+    return {
+        'part1': lambda: solve_part1(rotations),
+        'part2': lambda: solve_part2(rotations),
+    }
+
+
 def main():
     """Main entry point for Day 1 solution."""
     # Example test data
@@ -86,6 +492,20 @@ def main():
     example_part2 = solve_part2(example_rotations)
     print(f"  Part 1: {example_part1} (expected: 3)")
     print(f"  Part 2: {example_part2} (expected: 6)")
+    
+    # Streaming dial, resumed from a snapshot halfway through
+    dial = Dial().feed_many(example_rotations[:5])
+    dial = Dial.restore(dial.snapshot()).feed_many(example_rotations[5:])
+    print(f"  Stream: {dial.end_zeros}, {dial.click_zeros} (expected: 3, 6)")
+    assert (dial.end_zeros, dial.click_zeros) == (3, 6)
+    
+    # One pass for every starting position must agree with a dial per start
+    all_starts = counts_for_all_starts(example_rotations)
+    print(f"  All starts, from 50: {all_starts[50]} (expected: (3, 6))")
+    assert all_starts[50] == (3, 6)
+    for start, counts in enumerate(all_starts):
+        dial = Dial(start).feed_many(example_rotations)
+        assert counts == (dial.end_zeros, dial.click_zeros), start
     print()
     
     # Solve actual puzzle
@@ -94,8 +514,7 @@ def main():
     try:
         rotations = read_input(input_file)
         
-        part1_answer = solve_part1(rotations)
-        part2_answer = solve_part2(rotations)
+        part1_answer, part2_answer = solve_both(rotations)
         
         print("Puzzle answers:")
         print(f"  Part 1: {part1_answer}")
@@ -107,4 +526,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--stream' in sys.argv[1:]:
+        args = sys.argv[1:]
+        every = int(args[args.index('--every') + 1]) if '--every' in args else 1
+        stream_main(every=every)
+    else:
+        main()
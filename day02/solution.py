@@ -7,11 +7,27 @@ consists of some sequence of digits repeated exactly twice (e.g., 11, 6464, 1231
 
 import os
 import sys
+import time
+import tempfile
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.backend import np
 from utils.input_reader import read_input
+from utils.parallel import map_reduce
+
+
+# Powers of ten up to the int64/uint64 range, for digit counts and bounds
+POWERS_OF_TEN = [10 ** k for k in range(20)]
+
+# Default location of the precomputed invalid-ID index (see InvalidIdIndex)
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'invalid_ids.idx')
 
 
 def is_invalid_id(num):
@@ -64,15 +80,117 @@ def is_invalid_id_part2(num):
     return False
 
 
-def solve_part1(data):
+def digit_length(num):
+    """Number of decimal digits of a positive integer, without str()."""
+    return bisect_right(POWERS_OF_TEN, num)
+
+
+@lru_cache(maxsize=None)
+def repeat_multipliers(length, at_least_twice=False):
     """
-    Part 1: Find sum of all invalid IDs in the given ranges.
+    Multipliers R with "num is a repeated block" <=> num % R == 0.
+    
+    For a length-digit num, num is a period-digit block repeated
+    length/period times exactly when num is a multiple of
+    R = (10^length - 1) / (10^period - 1); the digit-length bound makes the
+    block exactly period digits long.
+    
+    For Part 2 only the maximal proper periods (length / prime) are needed:
+    any shorter period divides one of them, so at most a few checks remain.
+    
+    Args:
+        length: Digit length of the numbers to test
+        at_least_twice: Part 2 periods instead of exactly half
+    
+    Returns:
+        Tuple of multipliers, one per period to test
+    """
+    periods = candidate_periods(length, at_least_twice)
+    if at_least_twice:
+        periods = [period for period in periods
+                   if not any(other % period == 0 for other in periods if other > period)]
+    return tuple((POWERS_OF_TEN[length] - 1) // (POWERS_OF_TEN[period] - 1) for period in periods)
+
+
+def length_segments(start, end):
+    """Split [start, end] into (length, low, high) pieces of equal digit length (IDs >= 1)."""
+    segments = []
+    for length in range(max(1, digit_length(start)), digit_length(end) + 1):
+        low = max(start, POWERS_OF_TEN[length - 1])
+        high = min(end, POWERS_OF_TEN[length] - 1)
+        if low <= high:
+            segments.append((length, low, high))
+    return segments
+
+
+def brute_force_sum(start, end, at_least_twice=False):
+    """
+    Sum invalid IDs in [start, end] by testing every number.
+    
+    The range is split by digit length so each number costs only the
+    num % R checks for that length; no strings are built.
+    
+    Args:
+        start: First ID of the range
+        end: Last ID of the range (inclusive)
+        at_least_twice: Part 2 rule instead of Part 1
+    
+    Returns:
+        Sum of invalid IDs
+    """
+    total = 0
+    for length, low, high in length_segments(start, end):
+        multipliers = repeat_multipliers(length, at_least_twice)
+        if len(multipliers) == 1:
+            multiplier = multipliers[0]
+            total += sum(num for num in range(low, high + 1) if num % multiplier == 0)
+        elif len(multipliers) == 2:
+            first, second = multipliers
+            total += sum(num for num in range(low, high + 1)
+                         if num % first == 0 or num % second == 0)
+        elif multipliers:
+            total += sum(num for num in range(low, high + 1)
+                         if any(num % multiplier == 0 for multiplier in multipliers))
+    return total
+
+
+def brute_force_sum_numpy(start, end, at_least_twice=False, block_size=1 << 20):
+    """
+    Vectorised brute_force_sum: tests a whole block of the range at once.
+    
+    Args:
+        start: First ID of the range (IDs must fit in int64)
+        end: Last ID of the range (inclusive)
+        at_least_twice: Part 2 rule instead of Part 1
+        block_size: Numbers tested per NumPy operation
+    
+    Returns:
+        Sum of invalid IDs
+    """
+    total = 0
+    for length, low, high in length_segments(start, end):
+        multipliers = repeat_multipliers(length, at_least_twice)
+        if not multipliers:
+            continue
+        for block_start in range(low, high + 1, block_size):
+            values = np.arange(block_start, min(block_start + block_size, high + 1), dtype=np.int64)
+            invalid = np.zeros(len(values), dtype=bool)
+            for multiplier in multipliers:
+                invalid |= values % multiplier == 0
+            # Matches are sparse; summing as Python ints avoids int64 overflow
+            total += sum(values[invalid].tolist())
+    return total
+
+
+def parse_ranges(data):
+    """
+    Parse the comma-separated "start-end" ranges.
     
     Args:
         data: Puzzle input data (list of strings or single string)
     
     Returns:
-        Sum of all invalid product IDs
+        List of (start, end) tuples
     """
     # Parse the input - it's a single line with comma-separated ranges
     if isinstance(data, list):
@@ -80,66 +198,402 @@ def solve_part1(data):
     else:
         input_str = data.strip()
     
-    # Split by commas to get individual ranges
-    ranges = input_str.split(',')
-    
-    total_sum = 0
-    
-    for range_str in ranges:
+    ranges = []
+    for range_str in input_str.split(','):
         range_str = range_str.strip()
         if not range_str:
             continue
         
         # Parse the range "start-end"
         parts = range_str.split('-')
-        start = int(parts[0])
-        end = int(parts[1])
-        
-        # Check each ID in the range
-        for num in range(start, end + 1):
-            if is_invalid_id(num):
-                total_sum += num
+        ranges.append((int(parts[0]), int(parts[1])))
     
-    return total_sum
+    return ranges
 
 
-def solve_part2(data):
+def disjoint_segments(ranges, count_overlaps_once=False):
     """
-    Part 2: Find sum of all invalid IDs where a sequence is repeated at least twice.
+    Merge and deduplicate ranges into disjoint (start, end, multiplicity) segments.
+    
+    A sweep over the range boundaries splits overlapping ranges into pieces
+    covered by the same number of ranges, so shared IDs are only processed
+    once. With count_overlaps_once the pieces are coalesced and every ID
+    counts once; otherwise each piece keeps how many ranges covered it, which
+    reproduces the per-range answer.
+    
+    Args:
+        ranges: List of (start, end) tuples
+        count_overlaps_once: Count IDs in overlapping ranges once instead of per range
+    
+    Returns:
+        Sorted list of (start, end, multiplicity) tuples
+    """
+    changes = {}
+    for start, end in ranges:
+        changes[start] = changes.get(start, 0) + 1
+        changes[end + 1] = changes.get(end + 1, 0) - 1
+    
+    segments = []
+    coverage = 0
+    points = sorted(changes)
+    for point, next_point in zip(points, points[1:]):
+        coverage += changes[point]
+        if coverage <= 0:
+            continue
+        multiplicity = 1 if count_overlaps_once else coverage
+        if segments and segments[-1][1] == point - 1 and segments[-1][2] == multiplicity:
+            segments[-1] = (segments[-1][0], next_point - 1, multiplicity)
+        else:
+            segments.append((point, next_point - 1, multiplicity))
+    return segments
+
+
+def shard_segments(segments, shard_size):
+    """
+    Split segments into digit-length-aligned shards of at most shard_size IDs.
+    
+    Args:
+        segments: List of (start, end, multiplicity) tuples
+        shard_size: Maximum IDs per shard
+    
+    Returns:
+        List of (start, end, multiplicity) shards, each within one digit length
+    """
+    shards = []
+    for start, end, multiplicity in segments:
+        for _, low, high in length_segments(start, end):
+            for shard_start in range(low, high + 1, shard_size):
+                shards.append((shard_start, min(shard_start + shard_size - 1, high), multiplicity))
+    return shards
+
+
+def brute_force_shard(shard, at_least_twice=False):
+    """Brute-force sum of one (start, end, multiplicity) shard, for worker processes."""
+    start, end, multiplicity = shard
+    brute = brute_force_sum_numpy if np is not None else brute_force_sum
+    return multiplicity * brute(start, end, at_least_twice)
+
+
+def brute_force_shard_part2(shard):
+    """brute_force_shard with the Part 2 rule (picklable without a partial)."""
+    return brute_force_shard(shard, at_least_twice=True)
+
+
+def verify(data, count_overlaps_once=False, jobs=None, shard_size=1 << 22):
+    """
+    Check the arithmetic answers against a brute-force scan of every range.
+    
+    The ranges are merged first, then split into digit-length-aligned
+    shards that are scanned across a process pool, so one huge range can
+    use every core. Uses the NumPy block test when NumPy is installed,
+    otherwise the integer predicates.
     
     Args:
         data: Puzzle input data (list of strings or single string)
+        count_overlaps_once: Count IDs in overlapping ranges once instead of per range
+        jobs: Worker processes (default: utils.parallel.default_jobs())
+        shard_size: Maximum IDs per shard
     
     Returns:
-        Sum of all invalid product IDs (repeated at least twice)
+        Tuple of (part 1 ok, part 2 ok)
     """
-    # Parse the input - it's a single line with comma-separated ranges
-    if isinstance(data, list):
-        input_str = ''.join(data).strip()
-    else:
-        input_str = data.strip()
+    segments = disjoint_segments(parse_ranges(data), count_overlaps_once)
+    shards = shard_segments(segments, shard_size)
     
-    # Split by commas to get individual ranges
-    ranges = input_str.split(',')
+    results = []
+    for at_least_twice, brute in ((False, brute_force_shard), (True, brute_force_shard_part2)):
+        expected = map_reduce(shards, brute, jobs=jobs, chunksize=1, serial_below=2)
+        actual = sum(multiplicity * sum_invalid_ids(start, end, at_least_twice)
+                     for start, end, multiplicity in segments)
+        results.append(expected == actual)
+    return tuple(results)
+
+
+def mobius(n):
+    """Möbius function: 0 if n has a squared prime factor, else (-1)^(number of primes)."""
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    return -result if n > 1 else result
+
+
+def block_bounds(start, end, length, period):
+    """
+    Find the blocks whose repetition is a length-digit ID inside [start, end].
     
-    total_sum = 0
+    A length-digit ID made of a period-digit block repeated length/period
+    times equals block * multiplier, where multiplier = 10^(period*(k-1)) +
+    ... + 10^period + 1 (k = length/period), so the matching blocks form a
+    contiguous range that can be bounded by division.
     
-    for range_str in ranges:
-        range_str = range_str.strip()
-        if not range_str:
-            continue
+    Returns:
+        Tuple of (multiplier, first block, last block); empty if first > last
+    """
+    multiplier = (10 ** length - 1) // (10 ** period - 1)
+    low = max(start, 10 ** (length - 1))
+    high = min(end, 10 ** length - 1)
+    first = max(-(-low // multiplier), 10 ** (period - 1))
+    last = min(high // multiplier, 10 ** period - 1)
+    return multiplier, first, last
+
+
+def periodic_sum(start, end, length, period):
+    """Sum of length-digit IDs in [start, end] made of one period-digit block repeated."""
+    multiplier, first, last = block_bounds(start, end, length, period)
+    if first > last:
+        return 0
+    # Arithmetic series over the blocks
+    return multiplier * (first + last) * (last - first + 1) // 2
+
+
+def candidate_periods(length, at_least_twice):
+    """Block lengths to try: half the length for part 1, every proper divisor for part 2."""
+    if not at_least_twice:
+        return [length // 2] if length % 2 == 0 else []
+    return [period for period in range(1, length) if length % period == 0]
+
+
+def sum_invalid_ids(start, end, at_least_twice=False):
+    """
+    Sum the invalid IDs in [start, end] without scanning the range.
+    
+    Part 2 IDs can have several periods (222222 is 2x3, 3x2 and 6x1), so the
+    per-period sums are combined by inclusion-exclusion with Möbius weights:
+    the sum over IDs with some proper period of length L is
+    -sum(mobius(L/d) * periodic_sum(d)) over proper divisors d of L.
+    
+    Args:
+        start: First ID of the range
+        end: Last ID of the range (inclusive)
+        at_least_twice: Part 2 rule (repeated at least twice) instead of exactly twice
+    
+    Returns:
+        Sum of invalid IDs; cost depends on the digit count, not the range width
+    """
+    total = 0
+    for length in range(len(str(start)), len(str(end)) + 1):
+        for period in candidate_periods(length, at_least_twice):
+            weight = -mobius(length // period) if at_least_twice else 1
+            total += weight * periodic_sum(start, end, length, period)
+    return total
+
+
+def iter_invalid_ids(start, end, at_least_twice=False):
+    """
+    Generate the invalid IDs in [start, end] in ascending order.
+    
+    Only candidates of the form block * multiplier are visited, never the
+    whole range.
+    
+    Args:
+        start: First ID of the range
+        end: Last ID of the range (inclusive)
+        at_least_twice: Part 2 rule (repeated at least twice) instead of exactly twice
+    
+    Yields:
+        Invalid IDs
+    """
+    for length in range(len(str(start)), len(str(end)) + 1):
+        candidates = set()
+        for period in candidate_periods(length, at_least_twice):
+            multiplier, first, last = block_bounds(start, end, length, period)
+            candidates.update(block * multiplier for block in range(first, last + 1))
+        yield from sorted(candidates)
+
+
+class InvalidIdIndex:
+    """
+    Memory-mapped index of every invalid ID up to a digit bound.
+    
+    Holds the sorted "repeated twice" (Part 1) and "repeated at least twice"
+    (Part 2) IDs with prefix sums, so the sum over any range is two bisect
+    lookups. The file is laid out for mmap: a header followed by native
+    uint64 arrays. Prefix sums can exceed 64 bits and are split into low
+    and high words.
+    
+    Usage:
+        InvalidIdIndex.build(INDEX_FILE, max_digits=10)
+        index = InvalidIdIndex.open(INDEX_FILE)
+        index.range_sum(11, 22)
+    """
+    
+    MAGIC = b'AOC25D02'
+    HEADER = struct.Struct('=8sQQQ')  # magic, max_digits, part 1 count, part 2 count
+    
+    __slots__ = ('max_digits', 'tables', '_file', '_mmap', '_view')
+    
+    @classmethod
+    def build(cls, path, max_digits=10):
+        """
+        Write the index for all IDs below 10^max_digits.
         
-        # Parse the range "start-end"
-        parts = range_str.split('-')
-        start = int(parts[0])
-        end = int(parts[1])
+        Args:
+            path: Output file
+            max_digits: Largest ID length covered (at most 19)
+        
+        Returns:
+            Dict with build seconds, file size in bytes and ID counts
+        """
+        if not 1 <= max_digits <= 19:
+            raise ValueError(f"max_digits must be between 1 and 19, got {max_digits}")
+        
+        started = time.perf_counter()
+        parts = []
+        for at_least_twice in (False, True):
+            ids = array('Q', iter_invalid_ids(1, 10 ** max_digits - 1, at_least_twice))
+            low, high = array('Q', [0]), array('Q', [0])
+            running = 0
+            for value in ids:
+                running += value
+                low.append(running & 0xFFFFFFFFFFFFFFFF)
+                high.append(running >> 64)
+            parts.append((ids, low, high))
         
-        # Check each ID in the range
-        for num in range(start, end + 1):
-            if is_invalid_id_part2(num):
-                total_sum += num
+        with open(path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, max_digits, len(parts[0][0]), len(parts[1][0])))
+            for arrays in parts:
+                for values in arrays:
+                    values.tofile(f)
+        
+        return {
+            'seconds': time.perf_counter() - started,
+            'bytes': os.path.getsize(path),
+            'part1_ids': len(parts[0][0]),
+            'part2_ids': len(parts[1][0]),
+        }
     
-    return total_sum
+    @classmethod
+    def open(cls, path):
+        """
+        Memory-map an index written by build().
+        
+        Args:
+            path: Index file
+        
+        Returns:
+            InvalidIdIndex
+        """
+        index = cls()
+        index._file = open(path, 'rb')
+        index._mmap = mmap.mmap(index._file.fileno(), 0, access=mmap.ACCESS_READ)
+        index._view = memoryview(index._mmap)
+        
+        magic, max_digits, count1, count2 = cls.HEADER.unpack_from(index._mmap)
+        if magic != cls.MAGIC:
+            index.close()
+            raise ValueError(f"{path} is not a day 2 invalid-ID index")
+        index.max_digits = max_digits
+        
+        offset = cls.HEADER.size
+        index.tables = []
+        for count in (count1, count2):
+            arrays = []
+            for length in (count, count + 1, count + 1):
+                arrays.append(index._view[offset:offset + 8 * length].cast('Q'))
+                offset += 8 * length
+            index.tables.append(tuple(arrays))
+        return index
+    
+    def covers(self, end):
+        """Return True if IDs up to end are in the index."""
+        return end < 10 ** self.max_digits
+    
+    def range_sum(self, start, end, at_least_twice=False):
+        """
+        Sum of invalid IDs in [start, end] from two bisect lookups.
+        
+        Args:
+            start: First ID of the range
+            end: Last ID of the range (inclusive, must be covered)
+            at_least_twice: Part 2 rule instead of Part 1
+        
+        Returns:
+            Sum of invalid IDs in the range
+        """
+        ids, low, high = self.tables[at_least_twice]
+        first = bisect_left(ids, start)
+        last = bisect_right(ids, end)
+        return ((high[last] << 64) | low[last]) - ((high[first] << 64) | low[first])
+    
+    def close(self):
+        """Release the memory map."""
+        for arrays in getattr(self, 'tables', ()):
+            for view in arrays:
+                view.release()
+        self.tables = []
+        if getattr(self, '_view', None) is not None:
+            self._view.release()
+            self._mmap.close()
+            self._file.close()
+            self._view = None
+
+
+def range_sum(start, end, at_least_twice=False, index=None):
+    """Sum invalid IDs in [start, end], from the index when it covers the range."""
+    if index is not None and index.covers(end):
+        return index.range_sum(start, end, at_least_twice)
+    return sum_invalid_ids(start, end, at_least_twice)
+
+
+def solve_part1(data, index=None, count_overlaps_once=False):
+    """
+    Part 1: Find sum of all invalid IDs in the given ranges.
+    
+    Args:
+        data: Puzzle input data (list of strings or single string)
+        index: Optional InvalidIdIndex to answer ranges with bisect lookups
+        count_overlaps_once: Count IDs in overlapping ranges once instead of per range
+    
+    Returns:
+        Sum of all invalid product IDs
+    """
+    segments = disjoint_segments(parse_ranges(data), count_overlaps_once)
+    return sum(multiplicity * range_sum(start, end, index=index)
+               for start, end, multiplicity in segments)
+
+
+def solve_part2(data, index=None, count_overlaps_once=False):
+    """
+    Part 2: Find sum of all invalid IDs where a sequence is repeated at least twice.
+    
+    Args:
+        data: Puzzle input data (list of strings or single string)
+        index: Optional InvalidIdIndex to answer ranges with bisect lookups
+        count_overlaps_once: Count IDs in overlapping ranges once instead of per range
+    
+    Returns:
+        Sum of all invalid product IDs (repeated at least twice)
+    """
+    segments = disjoint_segments(parse_ranges(data), count_overlaps_once)
+    return sum(multiplicity * range_sum(start, end, at_least_twice=True, index=index)
+               for start, end, multiplicity in segments)
+
+
+def build_index_main(args):
+    """
+    Build the invalid-ID index and report its build time and size.
+    
+    Usage: python day02/solution.py --build-index [--digits N] [path]
+    """
+    digits = 10
+    if '--digits' in args:
+        position = args.index('--digits')
+        digits = int(args[position + 1])
+        del args[position:position + 2]
+    path = args[0] if args else INDEX_FILE
+    
+    stats = InvalidIdIndex.build(path, digits)
+    print(f"Built {path} (IDs below 10^{digits})")
+    print(f"  Part 1 IDs: {stats['part1_ids']:,}")
+    print(f"  Part 2 IDs: {stats['part2_ids']:,}")
+    print(f"  Size: {stats['bytes'] / 1024 / 1024:.2f} MiB")
+    print(f"  Build time: {stats['seconds']:.2f} s")
 
 
 def main():
@@ -159,6 +613,16 @@ def main():
         
         example_part2 = solve_part2(example_data)
         print(f"  Part 2: {example_part2} (expected: 4174379265)")
+        
+        # The memory-mapped index must agree with the arithmetic sums
+        with tempfile.TemporaryDirectory() as workdir:
+            index_path = os.path.join(workdir, 'invalid_ids.idx')
+            InvalidIdIndex.build(index_path, max_digits=10)
+            index = InvalidIdIndex.open(index_path)
+            indexed = (solve_part1(example_data, index), solve_part2(example_data, index))
+            index.close()
+        print(f"  Indexed: {indexed[0]}, {indexed[1]} (expected: 1227775554, 4174379265)")
+        assert indexed == (1227775554, 4174379265)
         print()
     
     # Solve actual puzzle
@@ -167,17 +631,33 @@ def main():
     try:
         data = read_input(input_file)
         
-        part1_answer = solve_part1(data)
+        # Use the precomputed index when one has been built
+        index = InvalidIdIndex.open(INDEX_FILE) if os.path.exists(INDEX_FILE) else None
+        
+        part1_answer = solve_part1(data, index)
         print("Puzzle answers:")
         print(f"  Part 1: {part1_answer}")
         
-        part2_answer = solve_part2(data)
+        part2_answer = solve_part2(data, index)
         print(f"  Part 2: {part2_answer}")
         
+        if index is not None:
+            index.close()
+        
     except FileNotFoundError:
         print(f"Input file not found: {input_file}")
         print("Please add your puzzle input to solve the actual puzzle.")
 
 
 if __name__ == "__main__":
-    main()
+    if '--build-index' in sys.argv[1:]:
+        build_index_main([arg for arg in sys.argv[1:] if arg != '--build-index'])
+    elif '--verify' in sys.argv[1:]:
+        args = sys.argv[1:]
+        jobs = int(args[args.index('--jobs') + 1]) if '--jobs' in args else None
+        part1_ok, part2_ok = verify(read_input(os.path.join(os.path.dirname(__file__), 'input.txt')),
+                                    count_overlaps_once='--once' in args, jobs=jobs)
+        print(f"Brute-force verify: Part 1 {'OK' if part1_ok else 'MISMATCH'}, "
+              f"Part 2 {'OK' if part2_ok else 'MISMATCH'}")
+    else:
+        main()
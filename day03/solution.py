@@ -8,12 +8,266 @@ bank and sum them.
 """
 
 import os
+import random
 import sys
+from array import array
+from functools import partial
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.backend import np, register
 from utils.input_reader import read_input
+from utils.parallel import map_reduce
+
+
+# Selections of at most 1/FIND_PATH_RATIO of a bank use tracked str.find calls,
+# which are cheaper than a Python pass over the whole bank
+FIND_PATH_RATIO = 10
+
+# Bytes per chunk read by each worker in stream mode
+STREAM_CHUNK_BYTES = 1 << 24
+
+# Digits converted by a single int() call, below the interpreter's default
+# int/str conversion limit of 4300 digits
+INT_CHUNK_DIGITS = 2048
+
+
+def banks_of(data):
+    """Return the non-empty, stripped banks from the input lines."""
+    return [bank for bank in (line.strip() for line in data) if bank]
+
+
+def select_digits(bank, k):
+    """
+    Largest k-digit subsequence of a bank, as a digit string.
+    
+    Both paths make the greedy choice (leftmost largest digit that still
+    leaves room for the rest) in O(L) for any k. When k is large the
+    monotonic stack does it in one Python pass: each digit pops the smaller
+    digits before it while digits may still be dropped, so every digit is
+    pushed and popped at most once. When k is small (at most L / 10) the
+    next occurrence of each digit value is tracked instead and only
+    advanced with C-level find calls; the scans for one digit value never
+    overlap, so they cover the bank at most 10 times in total, and the
+    Python work is O(10 k).
+    
+    Args:
+        bank: String (or bytes) of battery joltage digits
+        k: Number of batteries to turn on
+    
+    Returns:
+        Digits of the best selection, of the same type as bank (the whole
+        bank if k >= its length)
+    """
+    n = len(bank)
+    if k >= n:
+        return bank
+    if k <= 0:
+        return bank[:0]
+    
+    is_bytes = isinstance(bank, bytes)
+    if k * FIND_PATH_RATIO <= n:
+        alphabet = b'9876543210' if is_bytes else '9876543210'
+        # First occurrence of each digit value at or after some earlier pos (-1: none left)
+        next_at = [bank.find(digit) for digit in alphabet]
+        digits = []
+        pos = 0
+        for i in range(k):
+            end = n - k + i  # last position that leaves room for the rest
+            for slot, digit in enumerate(alphabet):
+                at = next_at[slot]
+                if at < 0:
+                    continue
+                if at < pos:
+                    at = next_at[slot] = bank.find(digit, pos)
+                    if at < 0:
+                        continue
+                if at <= end:
+                    break
+            digits.append(digit)
+            pos = at + 1
+        return bytes(digits) if is_bytes else ''.join(digits)
+    
+    to_drop = n - k
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for i, digit in enumerate(bank):
+        while to_drop and stack and stack[-1] < digit:
+            pop()
+            to_drop -= 1
+        if not to_drop:
+            # Nothing left to drop: the rest of the bank is kept as is
+            return (bytes(stack) if is_bytes else ''.join(stack)) + bank[i:]
+        push(digit)
+    return bytes(stack[:k]) if is_bytes else ''.join(stack[:k])
+
+
+def digits_to_int(digits):
+    """
+    Convert a digit string (or bytes) of any length to an int.
+    
+    int() refuses strings over 4300 digits by default and is quadratic
+    above that. The digits are instead split recursively into a high part
+    and a low part whose width is INT_CHUNK_DIGITS times a power of two,
+    so each int() call stays under the limit and the parts are joined with
+    Karatsuba multiplications by cached powers of ten. A 10^6-digit
+    selection converts in about a second.
+    
+    Args:
+        digits: String (or bytes) of decimal digits
+    
+    Returns:
+        Integer value (0 for an empty string)
+    """
+    if len(digits) <= INT_CHUNK_DIGITS:
+        return int(digits) if digits else 0
+    powers = {}
+    
+    def convert(lo, hi):
+        if hi - lo <= INT_CHUNK_DIGITS:
+            return int(digits[lo:hi])
+        width = INT_CHUNK_DIGITS
+        while 2 * width < hi - lo:
+            width *= 2
+        power = powers.get(width)
+        if power is None:
+            power = powers[width] = 10 ** width
+        return convert(lo, hi - width) * power + convert(hi - width, hi)
+    
+    return convert(0, len(digits))
+
+
+def max_joltage(bank, k):
+    """
+    Largest joltage from turning on exactly k batteries of a bank, in order.
+    
+    Args:
+        bank: String (or bytes) of battery joltage digits
+        k: Number of batteries to turn on
+    
+    Returns:
+        Maximum joltage for the bank (0 for an empty selection)
+    """
+    return digits_to_int(select_digits(bank, k))
+
+
+class Bank:
+    """
+    Bank preprocessed for best-selection queries at many sizes k.
+    
+    The digits are split into blocks of BLOCK digits. A sparse table over
+    the block maxima (level j holds, for every block i, the leftmost block
+    with the largest maximum among blocks i .. i + 2^j - 1) answers any run
+    of whole blocks with two lookups; the partial blocks at either end are
+    scanned with C-level max() and bytes.find. A window maximum therefore
+    costs O(BLOCK), so the greedy selection (leftmost largest digit that
+    still leaves room for the rest) is O(k) per best(k) after O(L)
+    preprocessing. The table holds L / BLOCK * log(L / BLOCK) array('I')
+    entries, a few MB for a 10^6-digit bank.
+    
+    Usage:
+        bank = Bank("818181911112111")
+        bank.best(2)          # 92
+        bank.best_all()       # ['9', '92', '911', ...]
+    """
+    
+    BLOCK = 64
+    
+    __slots__ = ('bank', 'digits', 'block_max', 'table')
+    
+    def __init__(self, bank):
+        self.bank = bank
+        self.digits = digits = bank.encode()
+        block = self.BLOCK
+        self.block_max = block_max = bytes(max(digits[i:i + block])
+                                           for i in range(0, len(digits), block))
+        self.table = [array('I', range(len(block_max)))]
+        width = 1
+        while 2 * width <= len(block_max):
+            prev = self.table[-1]
+            self.table.append(array('I', [a if block_max[a] >= block_max[b] else b
+                                          for a, b in zip(prev, prev[width:])]))
+            width *= 2
+    
+    def leftmost_max(self, lo, hi):
+        """Position of the leftmost largest digit in bank[lo:hi + 1]."""
+        digits = self.digits
+        block = self.BLOCK
+        first, last = lo // block + 1, hi // block - 1
+        if first > last:
+            # Within one block or two neighbouring blocks: scan directly
+            best = max(digits[lo:hi + 1])
+            return digits.find(best, lo, hi + 1)
+        
+        # Partial block on the left, whole blocks first..last, partial block on the right
+        left = max(digits[lo:first * block])
+        level = (last - first + 1).bit_length() - 1
+        row = self.table[level]
+        a, b = row[first], row[last - (1 << level) + 1]
+        middle_block = a if self.block_max[a] >= self.block_max[b] else b
+        middle = self.block_max[middle_block]
+        right = max(digits[(last + 1) * block:hi + 1])
+        
+        best = max(left, middle, right)
+        if left == best:
+            return digits.find(best, lo, first * block)
+        if middle == best:
+            return digits.find(best, middle_block * block, (middle_block + 1) * block)
+        return digits.find(best, (last + 1) * block, hi + 1)
+    
+    def best_digits(self, k):
+        """
+        Largest k-digit subsequence of the bank, as a digit string.
+        
+        Args:
+            k: Number of batteries to turn on
+        
+        Returns:
+            Digit string of the best selection (the whole bank if k >= its length)
+        """
+        n = len(self.digits)
+        if k >= n:
+            return self.bank
+        
+        picks = []
+        pos = 0
+        for i in range(k):
+            end = n - k + i
+            if pos == end:
+                # Window of one digit: everything left has to be kept
+                return ''.join(picks) + self.bank[pos:]
+            pos = self.leftmost_max(pos, end)
+            picks.append(self.bank[pos])
+            pos += 1
+        return ''.join(picks)
+    
+    def best(self, k):
+        """Largest joltage from turning on exactly k batteries (0 for k <= 0)."""
+        return digits_to_int(self.best_digits(k))
+    
+    def best_all(self):
+        """
+        Best selections for every k from 1 to the bank length.
+        
+        Returned as digit strings, since large selections exceed Python's
+        default int/str conversion limit.
+        
+        Returns:
+            List whose entry k - 1 is best_digits(k)
+        """
+        return [self.best_digits(k) for k in range(1, len(self.digits) + 1)]
+
+
+def solve_part1_bank(bank):
+    """Largest 2-digit joltage from a single bank."""
+    return max_joltage(bank, 2)
+
+
+def solve_part2_bank(bank):
+    """Largest 12-digit joltage from a single bank."""
+    return max_joltage(bank, 12)
 
 
 def solve_part1(data):
@@ -29,25 +283,7 @@ def solve_part1(data):
     Returns:
         Total output joltage (sum of max joltage from each bank)
     """
-    total_joltage = 0
-    
-    for bank in data:
-        bank = bank.strip()
-        if not bank:
-            continue
-            
-        max_joltage = 0
-        
-        # Try all pairs of positions (i, j) where i < j
-        for i in range(len(bank)):
-            for j in range(i + 1, len(bank)):
-                # Form a 2-digit number from positions i and j
-                joltage = int(bank[i] + bank[j])
-                max_joltage = max(max_joltage, joltage)
-        
-        total_joltage += max_joltage
-    
-    return total_joltage
+    return map_reduce(banks_of(data), solve_part1_bank)
 
 
 def solve_part2(data):
@@ -57,62 +293,277 @@ def solve_part2(data):
     For each bank (line), find the largest 12-digit number that can be formed
     by selecting exactly 12 batteries in their original order.
     
-    Strategy: To maximize the number, we want to keep the largest digits.
-    We'll remove the smallest digits (or smallest contributing digits) while
-    maintaining order.
-    
     Args:
         data: List of strings, each representing a bank of batteries
     
     Returns:
         Total output joltage (sum of max joltage from each bank)
     """
-    total_joltage = 0
+    return map_reduce(banks_of(data), solve_part2_bank)
+
+
+def chunk_spans(path, chunk_bytes=STREAM_CHUNK_BYTES):
+    """
+    Split a bank file into byte ranges that end on line boundaries.
+    
+    Only the few bytes after each nominal chunk end are read, to find the
+    next newline, so this is cheap even for files of many gigabytes.
+    
+    Args:
+        path: Bank file, one bank per line
+        chunk_bytes: Nominal chunk size in bytes
+    
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    spans = []
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            f.seek(end)
+            while end < size:
+                block = f.read(4096)
+                newline = block.find(b'\n')
+                if newline >= 0:
+                    end += newline + 1
+                    break
+                end += len(block)
+            spans.append((start, end))
+            start = end
+    return spans
+
+
+def span_joltages(path, ks, span):
+    """
+    Worker: sum the best joltages of every bank in one byte range.
+    
+    The chunk is split on newlines as bytes and never decoded to str.
     
-    for bank in data:
-        bank = bank.strip()
+    Args:
+        path: Bank file
+        ks: Tuple of selection sizes (e.g. (2, 12))
+        span: (start, end) byte offsets from chunk_spans()
+    
+    Returns:
+        Tuple of sums, one per k
+    """
+    start, end = span
+    with open(path, 'rb') as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    
+    sums = [0] * len(ks)
+    for line in chunk.split(b'\n'):
+        bank = line.strip()
         if not bank:
             continue
+        for i, k in enumerate(ks):
+            sums[i] += max_joltage(bank, k)
+    return tuple(sums)
+
+
+def add_sums(a, b):
+    """Element-wise sum of two tuples of partial sums."""
+    return tuple(x + y for x, y in zip(a, b))
+
+
+def stream_joltages(path, ks=(2, 12), jobs=None, chunk_bytes=STREAM_CHUNK_BYTES):
+    """
+    Sum the best joltages of a bank file too large to load at once.
+    
+    The file is cut into newline-aligned byte ranges; each worker process
+    reads and solves its own ranges and returns exact Python int partial
+    sums. Memory per process stays around chunk_bytes regardless of the
+    file size.
+    
+    Args:
+        path: Bank file, one bank per line
+        ks: Tuple of selection sizes (default: both parts)
+        jobs: Worker processes (default: utils.parallel.default_jobs())
+        chunk_bytes: Bytes read per task
+    
+    Returns:
+        Tuple of total joltages, one per k
+    """
+    return map_reduce(chunk_spans(path, chunk_bytes), partial(span_joltages, path, tuple(ks)),
+                      reducer=add_sums, initial=(0,) * len(ks), jobs=jobs,
+                      chunksize=1, serial_below=2)
+
+
+def stream_main(args):
+    """
+    Solve both parts of a bank file in streaming mode.
+    
+    Usage: python day03/solution.py --stream [--jobs N] [--chunk-mb M] [path]
+    """
+    jobs = None
+    chunk_bytes = STREAM_CHUNK_BYTES
+    if '--jobs' in args:
+        position = args.index('--jobs')
+        jobs = int(args[position + 1])
+        del args[position:position + 2]
+    if '--chunk-mb' in args:
+        position = args.index('--chunk-mb')
+        chunk_bytes = int(float(args[position + 1]) * 1024 * 1024)
+        del args[position:position + 2]
+    path = args[0] if args else os.path.join(os.path.dirname(__file__), 'input.txt')
+    
+    part1, part2 = stream_joltages(path, jobs=jobs, chunk_bytes=chunk_bytes)
+    print(f"Part 1: {part1}")
+    print(f"Part 2: {part2}")
+
+
+def bank_matrices(banks):
+    """
+    Group banks by length into uint8 digit matrices, one row per bank.
+    
+    Args:
+        banks: List of bank strings
+    
+    Returns:
+        List of (rows, length) uint8 arrays holding digit values
+    """
+    by_length = {}
+    for bank in banks:
+        by_length.setdefault(len(bank), []).append(bank)
+    
+    matrices = []
+    for length, group in by_length.items():
+        raw = np.frombuffer(''.join(group).encode(), dtype=np.uint8)
+        matrices.append((raw - ord('0')).reshape(len(group), length))
+    return matrices
+
+
+def select_digits_numpy(matrix, k, block_cells=1 << 19):
+    """
+    Greedy k-digit selection for every row of a digit matrix at once.
+    
+    Step i picks, in every row, the leftmost largest digit between the
+    row's previous pick and column L - k + i. Each cell is encoded as
+    digit << shift | (mask - column), so the leftmost maximum is the plain
+    maximum and the column can be read back from the key. A sparse table
+    of window maxima (level j covers 2^j columns) makes every step one
+    windowed-max lookup for all rows: two gathers and a np.maximum. Rows are
+    processed in blocks of about block_cells cells to bound memory.
+    
+    Args:
+        matrix: (rows, L) uint8 digit matrix from bank_matrices()
+        k: Number of batteries to turn on
+        block_cells: Approximate matrix cells per block
+    
+    Returns:
+        (rows, min(k, L)) uint8 array of the selected digits
+    """
+    rows, length = matrix.shape
+    if k >= length:
+        return matrix
+    
+    shift = max(1, (length - 1).bit_length())
+    column_mask = (1 << shift) - 1
+    dtype = np.uint16 if 10 << shift <= 1 << 16 else np.uint32
+    levels = (length - k + 1).bit_length()
+    reversed_columns = (column_mask - np.arange(length)).astype(dtype)
+    
+    picks = np.empty((rows, k), dtype=np.uint8)
+    block_rows = max(1, block_cells // length)
+    for first in range(0, rows, block_rows):
+        block = matrix[first:first + block_rows]
+        table = np.zeros((levels, len(block), length), dtype=dtype)
+        np.left_shift(block, shift, out=table[0], dtype=dtype)
+        table[0] |= reversed_columns
+        width = 1
+        for level in range(1, levels):
+            np.maximum(table[level - 1][:, :length - width], table[level - 1][:, width:],
+                       out=table[level][:, :length - width])
+            width *= 2
         
-        # We need to select 12 batteries from the bank
-        # To maximize, we want to keep the 12 batteries that form the largest number
-        # This is equivalent to removing (len(bank) - 12) batteries to minimize the result
-        
-        n = len(bank)
-        to_remove = n - 12
-        
-        if to_remove <= 0:
-            # If bank has 12 or fewer batteries, use all of them
-            max_joltage = int(bank)
-        else:
-            # Use a greedy approach: repeatedly remove the digit that,
-            # when removed, leaves the largest remaining number
-            # This is like finding the maximum by removing smallest "blocking" digits
-            
-            # Convert to list for easier manipulation
-            digits = list(bank)
-            
-            # Remove to_remove digits
-            for _ in range(to_remove):
-                # Find the position to remove:
-                # We want to remove the first digit that is smaller than the next digit
-                # If no such digit exists, remove the last digit
-                removed = False
-                for i in range(len(digits) - 1):
-                    if digits[i] < digits[i + 1]:
-                        digits.pop(i)
-                        removed = True
-                        break
-                
-                if not removed:
-                    # All digits are in descending order, remove the last one
-                    digits.pop()
-            
-            max_joltage = int(''.join(digits))
-        
-        total_joltage += max_joltage
+        row_idx = np.arange(len(block))
+        pos = np.zeros(len(block), dtype=np.intp)
+        for i in range(k):
+            end = length - k + i
+            level = np.frexp(end - pos + 1)[1] - 1  # floor(log2(window width))
+            best = np.maximum(table[level, row_idx, pos],
+                              table[level, row_idx, end - (1 << level) + 1])
+            picks[first:first + len(block), i] = best >> shift
+            pos = column_mask - (best & column_mask).astype(np.intp) + 1
+    return picks
+
+
+def joltage_sum_numpy(banks, k):
+    """
+    Sum of the best k-digit joltages of all banks.
+    
+    Digit columns are summed in NumPy and weighted by powers of ten as
+    Python ints, so the total is exact for any k.
     
-    return total_joltage
+    Args:
+        banks: List of bank strings
+        k: Number of batteries to turn on
+    
+    Returns:
+        Total output joltage
+    """
+    total = 0
+    for matrix in bank_matrices(banks):
+        picks = select_digits_numpy(matrix, k)
+        width = picks.shape[1]
+        column_sums = picks.sum(axis=0, dtype=np.int64)
+        total += sum(int(column_sum) * 10 ** (width - 1 - i)
+                     for i, column_sum in enumerate(column_sums))
+    return total
+
+
+@register('numpy', 'part1')
+def solve_part1_numpy(data):
+    """
+    Part 1 (NumPy backend): 2-digit selection for all banks at once.
+    
+    Args:
+        data: List of strings, each representing a bank of batteries
+    
+    Returns:
+        Total output joltage (sum of max joltage from each bank)
+    """
+    return joltage_sum_numpy(banks_of(data), 2)
+
+
+@register('numpy', 'part2')
+def solve_part2_numpy(data):
+    """
+    Part 2 (NumPy backend): 12-digit selection for all banks at once.
+    
+    Args:
+        data: List of strings, each representing a bank of batteries
+    
+    Returns:
+        Total output joltage (sum of max joltage from each bank)
+    """
+    return joltage_sum_numpy(banks_of(data), 12)
+
+
+def generate(size, seed=0):
+    """
+    Generate random 100-digit banks for benchmarking.
+    
+    Args:
+        size: Number of banks
+        seed: Random seed
+    
+    Returns:
+        List of bank strings
+    """
+    rng = random.Random(seed)
+    return [''.join(rng.choices('123456789', k=100)) for _ in range(size)]
+
+
+def bench(data):
+    """Benchmark hook for `python run.py 3 --bench`."""
+    return {
+        'part1': lambda: solve_part1(data),
+        'part2': lambda: solve_part2(data),
+    }
 
 
 def main():
@@ -135,6 +586,18 @@ def main():
         
         example_part2 = solve_part2(example_data)
         print(f"  Part 2: {example_part2} (expected: 3121910778619)")
+        
+        # Past the int/str conversion limit: dropping 1000 digits from
+        # "12" * 3000 removes the first 1000 ones
+        long_bank = '12' * 3000
+        expected = 2 * (10 ** 1000 - 1) // 9 * 10 ** 4000 + 12 * (10 ** 4000 - 1) // 99
+        assert max_joltage(long_bank, 5000) == expected
+        
+        # Preprocessed bank, queried at small and large k
+        bank_best = Bank(example_data[3]).best(2)
+        print(f"  Bank: {bank_best} (expected: 92)")
+        assert bank_best == 92
+        assert Bank(long_bank).best(5000) == expected
         print()
     
     # Solve actual puzzle
@@ -156,4 +619,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--stream' in sys.argv[1:]:
+        stream_main([arg for arg in sys.argv[1:] if arg != '--stream'])
+    else:
+        main()
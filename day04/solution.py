@@ -6,12 +6,57 @@ of paper in the eight adjacent positions. Count how many rolls can be accessed.
 """
 
 import os
+import random
 import sys
+import tempfile
+from functools import partial
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.backend import np, register
 from utils.input_reader import read_input
+from utils.instrument import count
+from utils.parallel import map_reduce
+
+
+# Maps '@' to a 1 byte and everything else to a 0 byte
+ROLL_BYTES = bytes(1 if i == ord('@') else 0 for i in range(256))
+
+# Maps a lane value 16 + box count (roll present, at most 3 neighbours) to 1
+ACCESSIBLE_LANES = bytes(1 if 17 <= i <= 20 else 0 for i in range(256))
+
+
+def _row_lanes(grid):
+    """
+    Encode each row as an int with one byte lane per cell (1 for a roll).
+    
+    Lane sums of up to nine cells stay below 256, so whole rows can be
+    added with plain int arithmetic without lanes carrying into each other.
+    """
+    return [int.from_bytes(row.encode().translate(ROLL_BYTES), 'big') for row in grid]
+
+
+def _box_counts(lanes, cols):
+    """
+    3x3 box sums (cell plus its 8 neighbours) for every row of byte lanes.
+    
+    Each row is summed horizontally with one-lane shifts, then the three
+    horizontal sums around a row are added. Cells outside the grid are
+    simply absent, which is the zero border.
+    """
+    mask = (1 << (8 * cols)) - 1
+    horizontal = [(row + (row << 8) + (row >> 8)) & mask for row in lanes]
+    
+    boxes = []
+    for r, middle in enumerate(horizontal):
+        box = middle
+        if r > 0:
+            box += horizontal[r - 1]
+        if r + 1 < len(horizontal):
+            box += horizontal[r + 1]
+        boxes.append(box)
+    return boxes
 
 
 def solve_part1(data):
@@ -20,6 +65,12 @@ def solve_part1(data):
     
     A roll is accessible if it has fewer than 4 rolls in the 8 adjacent positions.
     
+    Every row is an int of byte lanes, so the 8-neighbour counts for the
+    whole grid come from shifted row additions (_box_counts) instead of a
+    per-cell loop. A roll is accessible when its box sum, which includes
+    itself, is at most 4: rolls are tagged with +16 and the matching lanes
+    are counted with one bytes.translate per row.
+    
     Args:
         data: List of strings representing the grid
     
@@ -31,35 +82,15 @@ def solve_part1(data):
     
     # Parse grid
     grid = [line.strip() for line in data if line.strip()]
-    rows = len(grid)
-    cols = len(grid[0]) if rows > 0 else 0
-    
-    # Directions for 8 adjacent cells (including diagonals)
-    directions = [
-        (-1, -1), (-1, 0), (-1, 1),  # top-left, top, top-right
-        (0, -1),           (0, 1),   # left, right
-        (1, -1),  (1, 0),  (1, 1)    # bottom-left, bottom, bottom-right
-    ]
+    if not grid:
+        return 0
+    cols = len(grid[0])
     
+    lanes = _row_lanes(grid)
     accessible_count = 0
-    
-    # Check each position in the grid
-    for r in range(rows):
-        for c in range(cols):
-            # Only check positions with paper rolls
-            if grid[r][c] == '@':
-                # Count adjacent paper rolls
-                adjacent_rolls = 0
-                for dr, dc in directions:
-                    nr, nc = r + dr, c + dc
-                    # Check if position is within bounds
-                    if 0 <= nr < rows and 0 <= nc < cols:
-                        if grid[nr][nc] == '@':
-                            adjacent_rolls += 1
-                
-                # A roll is accessible if it has fewer than 4 adjacent rolls
-                if adjacent_rolls < 4:
-                    accessible_count += 1
+    for row, box in zip(lanes, _box_counts(lanes, cols)):
+        tagged = (box + (row << 4)).to_bytes(cols, 'big')
+        accessible_count += tagged.translate(ACCESSIBLE_LANES).count(1)
     
     return accessible_count
 
@@ -71,6 +102,14 @@ def solve_part2(data):
     Once accessible rolls are removed, more rolls may become accessible.
     Continue until no more rolls can be removed.
     
+    Removing a roll never makes another roll harder to reach, so the rolls
+    removed in the end do not depend on the order of removal (they are
+    everything outside the grid's 4-core). Instead of re-scanning the grid
+    every round, the rolls are peeled with a worklist: neighbour counts are
+    computed once, and removing a roll only decrements its neighbours,
+    queueing each one the moment its count drops below 4. Total work is
+    O(cells), and the answer equals the round-based removal.
+    
     Args:
         data: List of strings representing the grid
     
@@ -80,53 +119,454 @@ def solve_part2(data):
     if not data:
         return 0
     
-    # Parse grid into a mutable 2D list
-    grid = [list(line.strip()) for line in data if line.strip()]
-    rows = len(grid)
-    cols = len(grid[0]) if rows > 0 else 0
+    grid = [line.strip() for line in data if line.strip()]
+    if not grid:
+        return 0
+    rows, cols = len(grid), len(grid[0])
     
-    # Directions for 8 adjacent cells
-    directions = [
-        (-1, -1), (-1, 0), (-1, 1),
-        (0, -1),           (0, 1),
-        (1, -1),  (1, 0),  (1, 1)
-    ]
+    # Flat grid with a one-cell empty border, so neighbours need no bounds checks
+    width = cols + 2
+    offsets = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+    cells = bytearray((rows + 2) * width)
+    boxes = bytearray((rows + 2) * width)
+    lanes = _row_lanes(grid)
+    for r, (row, box) in enumerate(zip(lanes, _box_counts(lanes, cols)), start=1):
+        start = r * width + 1
+        cells[start:start + cols] = row.to_bytes(cols, 'big')
+        boxes[start:start + cols] = box.to_bytes(cols, 'big')
+    
+    # A roll's box count includes itself: accessible means a box count of at most 4
+    worklist = [i for i, (cell, box) in enumerate(zip(cells, boxes)) if cell and box <= 4]
     
+    total_removed = 0
+    updates = 0
+    while worklist:
+        i = worklist.pop()
+        cells[i] = 0
+        total_removed += 1
+        for offset in offsets:
+            j = i + offset
+            if cells[j]:
+                updates += 1
+                boxes[j] -= 1
+                # Queue each roll exactly once, when it first becomes accessible
+                if boxes[j] == 4:
+                    worklist.append(j)
+    
+    count('neighbour updates', updates)
+    return total_removed
+
+
+def _roll_array(data):
+    """Parse the grid into a uint8 NumPy array with 1 for each roll."""
+    grid = [line.strip() for line in data if line.strip()]
+    raw = np.frombuffer(''.join(grid).encode(), dtype=np.uint8)
+    return (raw == ord('@')).view(np.uint8).reshape(len(grid), len(grid[0]))
+
+
+def _neighbour_counts(rolls):
+    """
+    Count adjacent rolls for every cell using shifted slices of a padded grid.
+    
+    The 3x3 box sum is separable: three column-shifted slices are added
+    into row sums, then three row-shifted slices of those, which is four
+    additions instead of eight. Subtracting the cell itself leaves the
+    8-neighbour count.
+    """
+    padded = np.pad(rolls, 1)
+    horizontal = padded[:, :-2] + padded[:, 1:-1]
+    horizontal += padded[:, 2:]
+    counts = horizontal[:-2] + horizontal[1:-1]
+    counts += horizontal[2:]
+    counts -= rolls
+    return counts
+
+
+@register('numpy', 'part1')
+def solve_part1_numpy(data):
+    """
+    Part 1 (NumPy backend): whole-grid neighbour counts with shifted slices.
+    
+    Args:
+        data: List of strings representing the grid
+    
+    Returns:
+        Number of accessible rolls
+    """
+    if not data:
+        return 0
+    
+    rolls = _roll_array(data)
+    accessible = (rolls == 1) & (_neighbour_counts(rolls) < 4)
+    return int(np.count_nonzero(accessible))
+
+
+@register('numpy', 'part2')
+def solve_part2_numpy(data):
+    """
+    Part 2 (NumPy backend): each removal round is one vectorised sweep.
+    
+    Args:
+        data: List of strings representing the grid
+    
+    Returns:
+        Total number of rolls that can be removed
+    """
+    if not data:
+        return 0
+    
+    rolls = _roll_array(data)
     total_removed = 0
     
-    # Keep removing accessible rolls until none are left
     while True:
-        # Find all accessible rolls in current state
-        accessible = []
+        count('grid sweeps')
+        
+        accessible = (rolls == 1) & (_neighbour_counts(rolls) < 4)
+        removed = int(np.count_nonzero(accessible))
+        if not removed:
+            break
         
-        for r in range(rows):
-            for c in range(cols):
-                if grid[r][c] == '@':
-                    # Count adjacent rolls
-                    adjacent_rolls = 0
-                    for dr, dc in directions:
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < rows and 0 <= nc < cols:
-                            if grid[nr][nc] == '@':
-                                adjacent_rolls += 1
-                    
-                    # Roll is accessible if it has fewer than 4 adjacent rolls
-                    if adjacent_rolls < 4:
-                        accessible.append((r, c))
+        rolls[accessible] = 0
+        total_removed += removed
+    
+    return total_removed
+
+
+# Maps a grid row to a binary string with 1 for each roll
+ROLL_BITS = str.maketrans({'@': '1', '.': '0'})
+
+
+def _bitboard(grid):
+    """Pack each row into an int with one bit per cell (the first column is the top bit)."""
+    return [int(row.translate(ROLL_BITS), 2) for row in grid]
+
+
+def _crowded(above, row, below, mask):
+    """
+    Bitmask of the cells in a row that have at least 4 adjacent rolls.
+    
+    The 8 neighbour bitboards (shifted copies of the three rows) are added
+    with a bit-sliced counter: bits b0 and b1 hold the count modulo 4 for
+    every cell at once, and b2 latches once a count reaches 4, which is all
+    the threshold needs. Each step is a handful of whole-row int operations.
+    """
+    b0 = b1 = b2 = 0
+    for line in (above, below):
+        for x in ((line << 1) & mask, line, line >> 1):
+            carry = b0 & x
+            b0 ^= x
+            b2 |= b1 & carry
+            b1 ^= carry
+    for x in ((row << 1) & mask, row >> 1):
+        carry = b0 & x
+        b0 ^= x
+        b2 |= b1 & carry
+        b1 ^= carry
+    return b2
+
+
+def _accessible_rows(rows, mask, which):
+    """
+    Accessible rolls of the given row indices.
+    
+    Args:
+        rows: Bitboard rows
+        mask: Bitmask of the valid columns
+        which: Iterable of row indices to evaluate
+    
+    Returns:
+        Dict of row index -> bitmask of accessible rolls (non-empty only)
+    """
+    last = len(rows) - 1
+    accessible = {}
+    for r in which:
+        row = rows[r]
+        if not row:
+            continue
+        above = rows[r - 1] if r > 0 else 0
+        below = rows[r + 1] if r < last else 0
+        free = row & ~_crowded(above, row, below, mask)
+        if free:
+            accessible[r] = free
+    return accessible
+
+
+def _peel_rows(rows, mask, first, last):
+    """
+    Remove accessible rolls round by round until none are left.
+    
+    Only rows first..last are updated; rows outside that range (halo rows
+    owned by another band) are read but never changed. After the first
+    round, only rows next to a row that changed are re-evaluated.
+    
+    Args:
+        rows: Bitboard rows, updated in place
+        mask: Bitmask of the valid columns
+        first: First row index that may be changed
+        last: Last row index that may be changed
+    
+    Returns:
+        Number of rolls removed
+    """
+    dirty = range(first, last + 1)
+    total_removed = 0
+    
+    while True:
+        count('grid sweeps')
         
-        # If no rolls are accessible, we're done
+        accessible = _accessible_rows(rows, mask, dirty)
         if not accessible:
             break
         
-        # Remove all accessible rolls
-        for r, c in accessible:
-            grid[r][c] = '.'
+        for r, free in accessible.items():
+            rows[r] &= ~free
+            total_removed += bin(free).count('1')
         
-        total_removed += len(accessible)
+        dirty = sorted({n for r in accessible for n in (r - 1, r, r + 1) if first <= n <= last})
     
     return total_removed
 
 
+@register('bitboard', 'part1')
+def solve_part1_bitboard(data):
+    """
+    Part 1 (bitboard backend): bit-sliced neighbour counts on packed rows.
+    
+    Args:
+        data: List of strings representing the grid
+    
+    Returns:
+        Number of accessible rolls
+    """
+    grid = [line.strip() for line in data if line.strip()]
+    if not grid:
+        return 0
+    
+    rows = _bitboard(grid)
+    mask = (1 << len(grid[0])) - 1
+    accessible = _accessible_rows(rows, mask, range(len(rows)))
+    return sum(bin(free).count('1') for free in accessible.values())
+
+
+@register('bitboard', 'part2')
+def solve_part2_bitboard(data):
+    """
+    Part 2 (bitboard backend): removal rounds as bitwise row updates.
+    
+    Each round clears the accessible rolls of every row at once. Only rows
+    next to a row that changed can gain accessible rolls, so later rounds
+    re-evaluate just those.
+    
+    Args:
+        data: List of strings representing the grid
+    
+    Returns:
+        Total number of rolls that can be removed
+    """
+    grid = [line.strip() for line in data if line.strip()]
+    if not grid:
+        return 0
+    
+    rows = _bitboard(grid)
+    return _peel_rows(rows, (1 << len(grid[0])) - 1, 0, len(rows) - 1)
+
+
+def iter_grid_rows(path):
+    """Yield the non-empty, stripped rows of a grid file one at a time."""
+    with open(path) as f:
+        for line in f:
+            row = line.strip()
+            if row:
+                yield row
+
+
+def stream_part1(path):
+    """
+    Part 1 over a grid file without loading it: a sliding 3-row window.
+    
+    Args:
+        path: Grid file, one row per line
+    
+    Returns:
+        Number of accessible rolls
+    """
+    mask = 0
+    above = row = None
+    accessible_count = 0
+    for line in iter_grid_rows(path):
+        below = int(line.translate(ROLL_BITS), 2)
+        if row is None:
+            mask = (1 << len(line)) - 1
+        else:
+            accessible_count += bin(row & ~_crowded(above or 0, row, below, mask)).count('1')
+        above, row = row, below
+    
+    if row is not None:
+        accessible_count += bin(row & ~_crowded(above or 0, row, 0, mask)).count('1')
+    return accessible_count
+
+
+def split_bands(path, workdir, band_rows):
+    """
+    Pack a grid file into band files of band_rows bitboard rows each.
+    
+    Each row is stored as a fixed-width big-endian bit string, so a band of
+    a C-column grid takes band_rows * C / 8 bytes on disk and in memory.
+    
+    Args:
+        path: Grid file, one row per line
+        workdir: Directory for the band files
+        band_rows: Rows per band
+    
+    Returns:
+        Tuple of (list of band file paths, column count)
+    """
+    bands = []
+    cols = 0
+    out = None
+    for r, line in enumerate(iter_grid_rows(path)):
+        if r % band_rows == 0:
+            if out:
+                out.close()
+            cols = len(line)
+            bands.append(os.path.join(workdir, f'band{len(bands):06d}.bin'))
+            out = open(bands[-1], 'wb')
+        out.write(int(line.translate(ROLL_BITS), 2).to_bytes((cols + 7) // 8, 'big'))
+    if out:
+        out.close()
+    return bands, cols
+
+
+def peel_band(cols, task):
+    """
+    Worker: peel one band file as far as its current halo rows allow.
+    
+    The halo rows (the neighbouring bands' edge rows, or 0 at the grid
+    border) stay fixed. Any roll removed here is removable in the whole
+    grid too, since the halo can only lose rolls later.
+    
+    Args:
+        cols: Column count
+        task: Tuple of (band index, band path, halo row above, halo row below)
+    
+    Returns:
+        One-element list [(band index, rolls removed, first row, last row)]
+    """
+    index, path, above, below = task
+    width = (cols + 7) // 8
+    with open(path, 'rb') as f:
+        raw = f.read()
+    rows = [above] + [int.from_bytes(raw[i:i + width], 'big')
+                      for i in range(0, len(raw), width)] + [below]
+    
+    removed = _peel_rows(rows, (1 << cols) - 1, 1, len(rows) - 2)
+    if removed:
+        with open(path, 'wb') as f:
+            for row in rows[1:-1]:
+                f.write(row.to_bytes(width, 'big'))
+    return [(index, removed, rows[1], rows[-2])]
+
+
+def banded_part2(path, band_rows=1024, jobs=None, workdir=None):
+    """
+    Part 2 for grids too large for memory: tiled peeling with halo exchange.
+    
+    The grid is packed into band files. Each pass peels every band whose
+    halo changed, with its neighbours' edge rows from the previous pass as
+    fixed halos, in worker processes. The new edge rows are exchanged and
+    the passes repeat until no band removes anything. Because removal is
+    order-independent, the total equals the round-based answer. Only one
+    band per worker and two edge rows per band are held in memory.
+    
+    Args:
+        path: Grid file, one row per line
+        band_rows: Rows per band
+        jobs: Worker processes (default: utils.parallel.default_jobs())
+        workdir: Directory for band files (default: a temporary directory)
+    
+    Returns:
+        Total number of rolls that can be removed
+    """
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        bands, cols = split_bands(path, tmp, band_rows)
+        width = (cols + 7) // 8
+        edges = []
+        for band in bands:
+            with open(band, 'rb') as f:
+                first = int.from_bytes(f.read(width), 'big')
+                f.seek(-width, os.SEEK_END)
+                edges.append((first, int.from_bytes(f.read(width), 'big')))
+        
+        total_removed = 0
+        pending = set(range(len(bands)))
+        while pending:
+            count('band passes')
+            tasks = [(i, bands[i],
+                      edges[i - 1][1] if i > 0 else 0,
+                      edges[i + 1][0] if i + 1 < len(bands) else 0)
+                     for i in sorted(pending)]
+            results = map_reduce(tasks, partial(peel_band, cols), initial=[],
+                                 jobs=jobs, chunksize=1, serial_below=2)
+            
+            pending = set()
+            for i, removed, first, last in results:
+                total_removed += removed
+                if first != edges[i][0] and i > 0:
+                    pending.add(i - 1)
+                if last != edges[i][1] and i + 1 < len(bands):
+                    pending.add(i + 1)
+                edges[i] = (first, last)
+        
+        return total_removed
+
+
+def banded_main(args):
+    """
+    Solve both parts of a grid file out of core.
+    
+    Usage: python day04/solution.py --banded [--band-rows N] [--jobs N] [path]
+    """
+    band_rows = 1024
+    jobs = None
+    if '--band-rows' in args:
+        position = args.index('--band-rows')
+        band_rows = int(args[position + 1])
+        del args[position:position + 2]
+    if '--jobs' in args:
+        position = args.index('--jobs')
+        jobs = int(args[position + 1])
+        del args[position:position + 2]
+    path = args[0] if args else os.path.join(os.path.dirname(__file__), 'input.txt')
+    
+    print(f"Part 1: {stream_part1(path)}")
+    print(f"Part 2: {banded_part2(path, band_rows, jobs)}")
+
+
+def generate(size, seed=0):
+    """
+    Generate a random square grid for benchmarking.
+    
+    Args:
+        size: Approximate number of cells
+        seed: Random seed
+    
+    Returns:
+        List of grid rows
+    """
+    rng = random.Random(seed)
+    side = max(1, int(size ** 0.5))
+    return [''.join('@' if rng.random() < 0.6 else '.' for _ in range(side))
+            for _ in range(side)]
+
+
+def bench(data):
+    """Benchmark hook for `python run.py 4 --bench`."""
+    return {
+        'part1': lambda: solve_part1(data),
+        'part2': lambda: solve_part2(data),
+    }
+
+
 def main():
     """Main entry point for Day 4 solution."""
     # Example test data
@@ -153,6 +593,16 @@ def main():
         
         example_part2 = solve_part2(example_data)
         print(f"  Part 2: {example_part2} (expected: 43)")
+        
+        # Out-of-core paths, with bands small enough to exchange halos
+        with tempfile.TemporaryDirectory() as workdir:
+            grid_path = os.path.join(workdir, 'grid.txt')
+            with open(grid_path, 'w') as f:
+                f.write('\n'.join(example_data) + '\n')
+            streamed = stream_part1(grid_path)
+            banded = banded_part2(grid_path, band_rows=3, jobs=1, workdir=workdir)
+        print(f"  Streamed: {streamed}, banded: {banded} (expected: 13, 43)")
+        assert (streamed, banded) == (13, 43)
         print()
     
     # Solve actual puzzle
@@ -174,4 +624,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--banded' in sys.argv[1:]:
+        banded_main([arg for arg in sys.argv[1:] if arg != '--banded'])
+    else:
+        main()
@@ -6,16 +6,185 @@ Fresh ID ranges are inclusive and can overlap. Count how many available IDs
 fall within any fresh range.
 """
 
+import heapq
+import mmap
 import os
+import random
 import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.backend import np, register
 from utils.input_reader import read_input_groups
+from utils.parallel import map_reduce
 
 
-def solve_part1(data):
+MERGED_INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'merged_ranges.bin')
+
+# Estimated Python memory per buffered range: list slot, 2-tuple and two ints
+BUFFERED_RANGE_BYTES = 128
+
+# On disk, a range is two native uint64 values (start, end)
+RECORD_BYTES = 16
+
+
+def parse_ranges(lines):
+    """Parse "start-end" lines into a list of (start, end) tuples."""
+    ranges = []
+    for range_str in lines:
+        start, end = map(int, range_str.split('-'))
+        ranges.append((start, end))
+    return ranges
+
+
+def merge_ranges(ranges):
+    """
+    Merge overlapping or adjacent ranges.
+    
+    Args:
+        ranges: Iterable of inclusive (start, end) tuples
+    
+    Returns:
+        Sorted list of disjoint, non-adjacent (start, end) tuples
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            # Overlapping or adjacent - extend the last merged range
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            # Non-overlapping - add as new range
+            merged.append((start, end))
+    return merged
+
+
+class FreshIndex:
+    """
+    Merged fresh ranges as sorted start/end arrays for O(log R) lookups.
+    
+    An ID is fresh when the last merged range starting at or before it also
+    ends at or after it, which is one bisect. The total number of fresh IDs
+    (Part 2) is computed once while building.
+    
+    Usage:
+        index = FreshIndex(parse_ranges(['3-5', '10-14']))
+        index.contains(4)     # True
+        index.covered         # 8
+    """
+    
+    __slots__ = ('starts', 'ends', 'covered')
+    
+    def __init__(self, ranges):
+        merged = merge_ranges(ranges)
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+        self.covered = sum(end - start + 1 for start, end in merged)
+    
+    def contains(self, ingredient_id):
+        """Return True if the ID falls within any fresh range."""
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+    
+    def count_fresh_numpy(self, ids):
+        """
+        Count the fresh IDs of an int64 array with one searchsorted call.
+        
+        Args:
+            ids: NumPy int64 array of ingredient IDs
+        
+        Returns:
+            Number of fresh IDs
+        """
+        if not self.starts:
+            return 0
+        starts = np.array(self.starts, dtype=np.int64)
+        ends = np.array(self.ends, dtype=np.int64)
+        i = np.searchsorted(starts, ids, side='right') - 1
+        fresh = (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+        return int(np.count_nonzero(fresh))
+
+
+class IntervalSet(FreshIndex):
+    """
+    Mutable set of fresh IDs, stored as merged sorted start/end arrays.
+    
+    add_range and remove_range locate the affected intervals with bisect and
+    splice the result into the arrays, keeping them disjoint and
+    non-adjacent. The covered count is adjusted by the size of each change,
+    so covered_count() is O(1) instead of a full re-merge. Each interval is
+    created and deleted at most once, so the per-update work is amortised
+    O(log R) plus one C-level list splice.
+    
+    Removal has set semantics: remove_range(a, b) clears every ID in [a, b],
+    even if another added range also covered it.
+    
+    Usage:
+        fresh = IntervalSet()
+        fresh.add_range(3, 5)
+        fresh.add_range(10, 14)
+        fresh.remove_range(4, 11)
+        fresh.covered_count()   # 4 (3, 12, 13, 14)
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, ranges=()):
+        super().__init__(ranges)
+    
+    def covered_count(self):
+        """Number of IDs currently in the set."""
+        return self.covered
+    
+    def add_range(self, start, end):
+        """Add the inclusive range [start, end], merging with overlapping or adjacent intervals."""
+        if start > end:
+            return
+        # Intervals [i, j) touch [start, end]: end >= start - 1 and start <= end + 1
+        i = bisect_left(self.ends, start - 1)
+        j = bisect_right(self.starts, end + 1)
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j - 1])
+            self.covered -= sum(self.ends[k] - self.starts[k] + 1 for k in range(i, j))
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+        self.covered += end - start + 1
+    
+    def remove_range(self, start, end):
+        """Remove every ID in the inclusive range [start, end]."""
+        if start > end:
+            return
+        # Intervals [i, j) overlap [start, end]: end >= start and start <= end
+        i = bisect_left(self.ends, start)
+        j = bisect_right(self.starts, end)
+        if i >= j:
+            return
+        
+        self.covered -= sum(self.ends[k] - self.starts[k] + 1 for k in range(i, j))
+        new_starts, new_ends = [], []
+        if self.starts[i] < start:
+            new_starts.append(self.starts[i])
+            new_ends.append(start - 1)
+        if self.ends[j - 1] > end:
+            new_starts.append(end + 1)
+            new_ends.append(self.ends[j - 1])
+        self.covered += sum(e - s + 1 for s, e in zip(new_starts, new_ends))
+        self.starts[i:j] = new_starts
+        self.ends[i:j] = new_ends
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+
+def solve_part1(data, index=None):
     """
     Part 1: Count how many available ingredient IDs are fresh.
     
@@ -25,34 +194,40 @@ def solve_part1(data):
     Args:
         data: Two groups - first group is fresh ID ranges (e.g., "3-5"),
               second group is available ingredient IDs (e.g., "1")
+        index: FreshIndex of the ranges, shared with Part 2 (built if None)
     
     Returns:
         Number of fresh ingredient IDs
     """
-    # Parse the input groups
-    fresh_ranges = data[0]
-    available_ids = data[1]
-    
-    # Parse fresh ranges into list of (start, end) tuples
-    ranges = []
-    for range_str in fresh_ranges:
-        start, end = map(int, range_str.split('-'))
-        ranges.append((start, end))
+    if index is None:
+        index = FreshIndex(parse_ranges(data[0]))
     
     # Parse available IDs into integers
-    ids = [int(id_str) for id_str in available_ids]
+    ids = [int(id_str) for id_str in data[1]]
     
     # Count how many IDs are fresh (fall within any range)
-    fresh_count = 0
-    for ingredient_id in ids:
-        is_fresh = any(start <= ingredient_id <= end for start, end in ranges)
-        if is_fresh:
-            fresh_count += 1
+    return map_reduce(ids, index.contains)
+
+
+@register('numpy', 'part1')
+def solve_part1_numpy(data, index=None):
+    """
+    Part 1 (NumPy backend): classify all IDs with one searchsorted call.
+    
+    Args:
+        data: Two groups - fresh ID ranges and available ingredient IDs
+        index: FreshIndex of the ranges, shared with Part 2 (built if None)
     
-    return fresh_count
+    Returns:
+        Number of fresh ingredient IDs
+    """
+    if index is None:
+        index = FreshIndex(parse_ranges(data[0]))
+    ids = np.array(data[1], dtype=np.int64)
+    return index.count_fresh_numpy(ids)
 
 
-def solve_part2(data):
+def solve_part2(data, index=None):
     """
     Part 2: Count total ingredient IDs considered fresh by the ranges.
     
@@ -61,43 +236,239 @@ def solve_part2(data):
     total IDs are covered by all the fresh ranges combined.
     
     Uses range merging optimization: instead of creating a set of millions of IDs,
-    we merge overlapping/adjacent ranges and count the total span.
+    the ranges are merged (the same FreshIndex that Part 1 queries) and the
+    merged spans are counted.
     
     Args:
         data: Two groups - first group is fresh ID ranges (e.g., "3-5")
               (second group is ignored for part 2)
+        index: FreshIndex of the ranges, shared with Part 1 (built if None)
     
     Returns:
         Total count of ingredient IDs considered fresh by the ranges
     """
-    # Parse the fresh ranges
-    fresh_ranges = data[0]
+    if index is None:
+        index = FreshIndex(parse_ranges(data[0]))
+    return index.covered
+
+
+def iter_range_lines(path):
+    """Yield the stripped lines of the ranges section (up to the first blank line)."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                return
+            yield line
+
+
+def write_run(ranges, path):
+    """Sort and coalesce a buffer of ranges and write it as one binary run."""
+    with open(path, 'wb') as f:
+        array('Q', chain.from_iterable(merge_ranges(ranges))).tofile(f)
+
+
+def iter_run(path, block_records):
+    """Yield the (start, end) records of a binary run, reading block_records at a time."""
+    with open(path, 'rb') as f:
+        while True:
+            block = array('Q')
+            block.frombytes(f.read(block_records * RECORD_BYTES))
+            if not block:
+                return
+            yield from zip(block[0::2], block[1::2])
+
+
+def merge_runs(runs, out_path, block_records):
+    """
+    k-way merge sorted runs into one run, coalescing overlaps as a stream.
     
-    # Parse fresh ranges into list of (start, end) tuples
-    ranges = []
-    for range_str in fresh_ranges:
-        start, end = map(int, range_str.split('-'))
-        ranges.append((start, end))
+    Args:
+        runs: Paths of sorted, coalesced runs
+        out_path: Output run path
+        block_records: Records buffered per input and for the output
+    
+    Returns:
+        Tuple of (IDs covered, ranges written)
+    """
+    covered = written = 0
+    out = array('Q')
+    current = None
+    with open(out_path, 'wb') as f:
+        for start, end in heapq.merge(*(iter_run(run, block_records) for run in runs)):
+            if current and start <= current[1] + 1:
+                # Overlapping or adjacent - extend the current range
+                if end > current[1]:
+                    current[1] = end
+                continue
+            if current:
+                out.extend(current)
+                covered += current[1] - current[0] + 1
+                written += 1
+                if len(out) >= 2 * block_records:
+                    out.tofile(f)
+                    out = array('Q')
+            current = [start, end]
+        if current:
+            out.extend(current)
+            covered += current[1] - current[0] + 1
+            written += 1
+        out.tofile(f)
+    return covered, written
+
+
+def external_merge(path, index_path=MERGED_INDEX_FILE, buffer_bytes=64 << 20,
+                   max_fan_in=64, workdir=None):
+    """
+    Merge the fresh ranges of an input file too large for memory.
     
-    # Sort ranges by start position
-    ranges.sort()
+    The ranges section is read line by line into a buffer of about
+    buffer_bytes. Each full buffer is sorted, coalesced and written as a
+    binary run of native uint64 (start, end) records. The runs are then
+    k-way merged with heapq.merge, at most max_fan_in at a time (in several
+    passes if needed), coalescing overlapping and adjacent ranges on the fly.
+    Every merge input and the output read and write in blocks that share
+    the same buffer, so peak memory stays around buffer_bytes.
     
-    # Merge overlapping or adjacent ranges
-    merged = []
-    for start, end in ranges:
-        if merged and start <= merged[-1][1] + 1:
-            # Overlapping or adjacent - extend the last merged range
-            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+    Args:
+        path: Input file (ranges, a blank line, then IDs, which are ignored)
+        index_path: Where to write the merged ranges (same record format)
+        buffer_bytes: Memory budget for buffering ranges and merge blocks
+        max_fan_in: Maximum runs merged at once
+        workdir: Directory for temporary runs (default: system temp dir)
+    
+    Returns:
+        Tuple of (total IDs covered, number of merged ranges)
+    """
+    run_ranges = max(1, buffer_bytes // BUFFERED_RANGE_BYTES)
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        runs = []
+        buffer = []
+        for line in iter_range_lines(path):
+            start, end = map(int, line.split('-'))
+            buffer.append((start, end))
+            if len(buffer) >= run_ranges:
+                runs.append(os.path.join(tmp, f'run{len(runs):06d}.bin'))
+                write_run(buffer, runs[-1])
+                buffer = []
+        if buffer or not runs:
+            runs.append(os.path.join(tmp, f'run{len(runs):06d}.bin'))
+            write_run(buffer, runs[-1])
+        del buffer
+        
+        passes = 0
+        while len(runs) > max_fan_in:
+            passes += 1
+            block_records = max(1, buffer_bytes // RECORD_BYTES // (max_fan_in + 1))
+            merged_runs = []
+            for i in range(0, len(runs), max_fan_in):
+                merged_runs.append(os.path.join(tmp, f'pass{passes}_{len(merged_runs):06d}.bin'))
+                merge_runs(runs[i:i + max_fan_in], merged_runs[-1], block_records)
+            runs = merged_runs
+        
+        block_records = max(1, buffer_bytes // RECORD_BYTES // (len(runs) + 1))
+        return merge_runs(runs, index_path, block_records)
+
+
+class MergedRangeFile:
+    """
+    Memory-mapped merged ranges written by external_merge().
+    
+    The records are sorted and disjoint, so contains() is a bisect over the
+    start values without loading the file.
+    
+    Usage:
+        with MergedRangeFile(MERGED_INDEX_FILE) as index:
+            index.contains(17)
+    """
+    
+    __slots__ = ('_file', '_mmap', '_records', '_starts')
+    
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        if os.path.getsize(path):
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._records = memoryview(self._mmap).cast('Q')
         else:
-            # Non-overlapping - add as new range
-            merged.append((start, end))
+            self._mmap = None
+            self._records = memoryview(array('Q'))
+        self._starts = self._records[0::2]
+    
+    def __len__(self):
+        return len(self._starts)
+    
+    def contains(self, ingredient_id):
+        """Return True if the ID falls within any merged range."""
+        i = bisect_right(self._starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self._records[2 * i + 1]
+    
+    def close(self):
+        """Release the memory map."""
+        self._starts.release()
+        self._records.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def external_main(args):
+    """
+    Merge the ranges of a large input file out of core.
+    
+    Usage: python day05/solution.py --external [--buffer-mb M] [--index PATH] [path]
+    """
+    buffer_bytes = 64 << 20
+    index_path = MERGED_INDEX_FILE
+    if '--buffer-mb' in args:
+        position = args.index('--buffer-mb')
+        buffer_bytes = int(float(args[position + 1]) * 1024 * 1024)
+        del args[position:position + 2]
+    if '--index' in args:
+        position = args.index('--index')
+        index_path = args[position + 1]
+        del args[position:position + 2]
+    path = args[0] if args else os.path.join(os.path.dirname(__file__), 'input.txt')
+    
+    covered, merged = external_merge(path, index_path, buffer_bytes)
+    print(f"Part 2: {covered}")
+    print(f"Merged ranges: {merged:,} (written to {index_path})")
+
+
+def generate(size, seed=0):
+    """
+    Generate random ranges and ingredient IDs for benchmarking.
     
-    # Count total IDs in merged ranges
-    total = 0
-    for start, end in merged:
-        total += end - start + 1
+    Args:
+        size: Number of ingredient IDs (with size // 10 ranges)
+        seed: Random seed
     
-    return total
+    Returns:
+        List of lines: the ranges followed by the IDs
+    """
+    rng = random.Random(seed)
+    limit = 10 ** 15
+    ranges = []
+    for _ in range(max(1, size // 10)):
+        start = rng.randrange(limit)
+        ranges.append(f"{start}-{start + rng.randrange(limit // 1000)}")
+    return ranges + [str(rng.randrange(limit)) for _ in range(size)]
+
+
+def bench(lines):
+    """Benchmark hook for `python run.py 5 --bench` (takes the flat input lines)."""
+    data = [[line for line in lines if '-' in line],
+            [line for line in lines if '-' not in line]]
+    return {
+        'part1': lambda: solve_part1(data),
+        'part2': lambda: solve_part2(data),
+    }
 
 
 def main():
@@ -113,11 +484,41 @@ def main():
     
     if example_data:
         print("Testing with example:")
-        example_part1 = solve_part1(example_data)
+        example_index = FreshIndex(parse_ranges(example_data[0]))
+        example_part1 = solve_part1(example_data, example_index)
         print(f"  Part 1: {example_part1} (expected: 3)")
         
-        example_part2 = solve_part2(example_data)
+        example_part2 = solve_part2(example_data, example_index)
         print(f"  Part 2: {example_part2} (expected: 14)")
+        
+        # Updates on a mutable set keep the covered count in step
+        fresh = IntervalSet()
+        for line in example_data[0]:
+            fresh.add_range(*map(int, line.split('-')))
+        added = fresh.covered_count()
+        fresh.remove_range(4, 11)
+        removed = fresh.covered_count()
+        print(f"  Interval set: {added}, then {removed} (expected: 14, then 10)")
+        assert (added, removed) == (14, 10)
+        assert [fresh.contains(i) for i in (3, 4, 11, 12)] == [True, False, False, True]
+        fresh.add_range(4, 11)
+        assert fresh.covered_count() == 18 and list(fresh) == [(3, 20)]
+        
+        # External merge with one range per run and two-way merge passes
+        with tempfile.TemporaryDirectory() as workdir:
+            input_path = os.path.join(workdir, 'input.txt')
+            with open(input_path, 'w') as f:
+                f.write('\n'.join(example_data[0]) + '\n\n' + '\n'.join(example_data[1]) + '\n')
+            index_path = os.path.join(workdir, 'merged.bin')
+            covered, merged_count = external_merge(input_path, index_path,
+                                                   buffer_bytes=BUFFERED_RANGE_BYTES,
+                                                   max_fan_in=2, workdir=workdir)
+            with MergedRangeFile(index_path) as merged:
+                fresh_ids = sum(merged.contains(int(i)) for i in example_data[1])
+                assert len(merged) == merged_count
+        print(f"  External merge: {covered}, {merged_count} ranges, {fresh_ids} fresh "
+              f"(expected: 14, 2 ranges, 3 fresh)")
+        assert (covered, merged_count, fresh_ids) == (14, 2, 3)
         print()
     
     # Solve actual puzzle
@@ -131,11 +532,14 @@ def main():
             print("Please add your puzzle input to solve the actual puzzle.")
             return
         
-        part1_answer = solve_part1(data)
+        # Parse, sort and merge the ranges once for both parts
+        index = FreshIndex(parse_ranges(data[0]))
+        
+        part1_answer = solve_part1(data, index)
         print("Puzzle answers:")
         print(f"  Part 1: {part1_answer}")
         
-        part2_answer = solve_part2(data)
+        part2_answer = solve_part2(data, index)
         print(f"  Part 2: {part2_answer}")
         
     except FileNotFoundError:
@@ -144,4 +548,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--external' in sys.argv[1:]:
+        external_main([arg for arg in sys.argv[1:] if arg != '--external'])
+    else:
+        main()
@@ -6,11 +6,13 @@ Find the 1000 shortest connections and multiply the sizes of the 3 largest circu
 """
 
 import os
+import random
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.backend import np, register
 from utils.input_reader import read_input
 
 
@@ -175,6 +177,134 @@ def solve_part2(data):
     return 0  # Should not reach here if input is valid
 
 
+def _sorted_pairs_numpy(data):
+    """
+    Compute all pairwise squared distances with NumPy and sort them.
+    
+    Pairs come from np.triu_indices (ordered by i, then j) and are sorted
+    stably, so ties break exactly like sorting (dist_sq, i, j) tuples.
+    
+    Args:
+        data: List of coordinate strings in format "x,y,z"
+    
+    Returns:
+        Tuple of (coords array, first indices, second indices) in distance order
+    """
+    coords = np.array([line.split(',') for line in data], dtype=np.int64)
+    first, second = np.triu_indices(len(coords), k=1)
+    diff = coords[first] - coords[second]
+    dist_sq = np.einsum('ij,ij->i', diff, diff)
+    order = np.argsort(dist_sq, kind='stable')
+    return coords, first[order].tolist(), second[order].tolist()
+
+
+def _union_find(n):
+    """
+    Create a Union-Find structure over n elements.
+    
+    Returns:
+        Tuple of (find, union, size) where union returns True if it merged
+    """
+    parent = list(range(n))
+    size = [1] * n
+    
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+        return x
+    
+    def union(x, y):
+        root_x, root_y = find(x), find(y)
+        if root_x == root_y:
+            return False
+        if size[root_x] < size[root_y]:
+            root_x, root_y = root_y, root_x
+        parent[root_y] = root_x
+        size[root_x] += size[root_y]
+        return True
+    
+    return find, union, size
+
+
+@register('numpy', 'part1')
+def solve_part1_numpy(data, num_connections=1000):
+    """
+    Part 1 (NumPy backend): vectorised pairwise distances, then Union-Find.
+    
+    Args:
+        data: List of coordinate strings in format "x,y,z"
+        num_connections: Number of connections to make (default 1000)
+    
+    Returns:
+        Product of the three largest circuit sizes
+    """
+    coords, first, second = _sorted_pairs_numpy(data)
+    n = len(coords)
+    find, union, size = _union_find(n)
+    
+    for i, j in zip(first[:num_connections], second[:num_connections]):
+        union(i, j)
+    
+    sizes = sorted((size[root] for root in {find(i) for i in range(n)}), reverse=True)
+    
+    product = 1 if sizes else 0
+    for circuit_size in sizes[:3]:
+        product *= circuit_size
+    return product
+
+
+@register('numpy', 'part2')
+def solve_part2_numpy(data):
+    """
+    Part 2 (NumPy backend): vectorised pairwise distances, then Kruskal.
+    
+    Tracks the number of circuits incrementally instead of recounting roots
+    after every successful union.
+    
+    Args:
+        data: List of coordinate strings in format "x,y,z"
+    
+    Returns:
+        Product of X coordinates of the final connecting pair
+    """
+    coords, first, second = _sorted_pairs_numpy(data)
+    circuits = len(coords)
+    _, union, _ = _union_find(circuits)
+    
+    for i, j in zip(first, second):
+        if union(i, j):
+            circuits -= 1
+            if circuits == 1:
+                return int(coords[i][0] * coords[j][0])
+    
+    return 0
+
+
+def generate(size, seed=0):
+    """
+    Generate random junction box coordinates for benchmarking.
+    
+    Args:
+        size: Number of junction boxes
+        seed: Random seed
+    
+    Returns:
+        List of coordinate strings in format "x,y,z"
+    """
+    rng = random.Random(seed)
+    return [f"{rng.randrange(100000)},{rng.randrange(100000)},{rng.randrange(100000)}"
+            for _ in range(size)]
+
+
+def bench(data):
+    """Benchmark hook for `python run.py 8 --bench`."""
+    return {
+        'part1': lambda: solve_part1(data),
+        'part2': lambda: solve_part2(data),
+    }
+
+
 def main():
     """Main entry point for Day 8 solution."""
     # Example test data
@@ -5,12 +5,15 @@ Find the largest rectangle that can be formed using red tiles as opposite corner
 """
 
 import os
+import random
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.backend import np, register
 from utils.input_reader import read_input
+from utils.instrument import count
 
 
 def solve_part1(data):
@@ -48,24 +51,17 @@ def solve_part1(data):
     return max_area
 
 
-def solve_part2(data):
+def build_compressed_grid(red_tiles):
     """
-    Part 2: Find largest rectangle using only red and green tiles
-    
-    Uses coordinate compression to work in compact space.
+    Build the red/green tile grid in compressed coordinates.
     
     Args:
-        data: List of strings in format "x,y" representing red tile coordinates
+        red_tiles: List of (x, y) red tile coordinates in loop order
     
     Returns:
-        Largest rectangle area using only red/green tiles
+        Tuple of (grid, x_to_idx, y_to_idx) where grid[cy][cx] is True for
+        red or green tiles
     """
-    # Parse red tile coordinates
-    red_tiles = []
-    for line in data:
-        x, y = map(int, line.split(','))
-        red_tiles.append((x, y))
-    
     # Coordinate compression: map actual coords to compressed indices
     all_x = sorted(set(x for x, y in red_tiles))
     all_y = sorted(set(y for x, y in red_tiles))
@@ -119,8 +115,32 @@ def solve_part2(data):
                 for cx in range(cx_start, cx_end + 1):
                     grid[cy][cx] = True
     
+    return grid, x_to_idx, y_to_idx
+
+
+def solve_part2(data):
+    """
+    Part 2: Find largest rectangle using only red and green tiles
+    
+    Uses coordinate compression to work in compact space.
+    
+    Args:
+        data: List of strings in format "x,y" representing red tile coordinates
+    
+    Returns:
+        Largest rectangle area using only red/green tiles
+    """
+    # Parse red tile coordinates
+    red_tiles = []
+    for line in data:
+        x, y = map(int, line.split(','))
+        red_tiles.append((x, y))
+    
+    grid, x_to_idx, y_to_idx = build_compressed_grid(red_tiles)
+    
     # Find largest rectangle with red corners
     max_area = 0
+    cells_checked = 0
     
     for i in range(len(red_tiles)):
         x1, y1 = red_tiles[i]
@@ -145,15 +165,124 @@ def solve_part2(data):
                     if not grid[cy][cx]:
                         valid = False
                         break
+                # Counted per row, so the inner loop stays as tight as before
+                cells_checked += cx - min_cx + 1
             
             if valid:
                 # Calculate area in ORIGINAL coordinates
                 area = (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1)
                 max_area = max(max_area, area)
     
+    count('rectangle cells checked', cells_checked)
+    
     return max_area
 
 
+@register('numpy', 'part1')
+def solve_part1_numpy(data):
+    """
+    Part 1 (NumPy backend): areas of all corner pairs in one broadcast.
+    
+    Args:
+        data: List of strings in format "x,y" representing red tile coordinates
+    
+    Returns:
+        Largest rectangle area
+    """
+    tiles = np.array([line.split(',') for line in data], dtype=np.int64).reshape(-1, 2)
+    first, second = np.triu_indices(len(tiles), k=1)
+    dx = np.abs(tiles[first, 0] - tiles[second, 0])
+    dy = np.abs(tiles[first, 1] - tiles[second, 1])
+    areas = np.where((dx != 0) & (dy != 0), (dx + 1) * (dy + 1), 0)
+    return int(areas.max()) if len(areas) else 0
+
+
+@register('numpy', 'part2')
+def solve_part2_numpy(data):
+    """
+    Part 2 (NumPy backend): prefix-sum rectangle checks for all corner pairs.
+    
+    A 2D prefix sum over the compressed grid gives the number of red/green
+    cells inside any rectangle in O(1); a rectangle is valid when that count
+    equals its compressed cell count. All pairs are checked at once.
+    
+    Args:
+        data: List of strings in format "x,y" representing red tile coordinates
+    
+    Returns:
+        Largest rectangle area using only red/green tiles
+    """
+    red_tiles = [tuple(map(int, line.split(','))) for line in data]
+    grid, x_to_idx, y_to_idx = build_compressed_grid(red_tiles)
+    
+    filled = np.array(grid, dtype=np.int64)
+    prefix = np.zeros((filled.shape[0] + 1, filled.shape[1] + 1), dtype=np.int64)
+    prefix[1:, 1:] = filled.cumsum(axis=0).cumsum(axis=1)
+    
+    tiles = np.array(red_tiles, dtype=np.int64)
+    cx = np.array([x_to_idx[x] for x, _ in red_tiles])
+    cy = np.array([y_to_idx[y] for _, y in red_tiles])
+    first, second = np.triu_indices(len(red_tiles), k=1)
+    
+    # Half-open compressed bounds [x0, x1) x [y0, y1)
+    x0 = np.minimum(cx[first], cx[second])
+    x1 = np.maximum(cx[first], cx[second]) + 1
+    y0 = np.minimum(cy[first], cy[second])
+    y1 = np.maximum(cy[first], cy[second]) + 1
+    
+    inside = prefix[y1, x1] - prefix[y0, x1] - prefix[y1, x0] + prefix[y0, x0]
+    valid = ((cx[first] != cx[second]) & (cy[first] != cy[second])
+             & (inside == (x1 - x0) * (y1 - y0)))
+    
+    if not valid.any():
+        return 0
+    
+    dx = np.abs(tiles[first, 0] - tiles[second, 0]) + 1
+    dy = np.abs(tiles[first, 1] - tiles[second, 1]) + 1
+    return int((dx * dy)[valid].max())
+
+
+def generate(size, seed=0):
+    """
+    Generate a random rectilinear loop of red tiles for benchmarking.
+    
+    The loop is a "skyline": a staircase of columns with random heights
+    above a flat bottom edge.
+    
+    Args:
+        size: Approximate number of red tiles
+        seed: Random seed
+    
+    Returns:
+        List of strings in format "x,y"
+    """
+    rng = random.Random(seed)
+    columns = max(2, size // 2 - 1)
+    xs = sorted(rng.sample(range(1, columns * 100), columns + 1))
+    
+    heights = []
+    for _ in range(columns):
+        height = rng.randint(1, 100000)
+        while heights and height == heights[-1]:
+            height = rng.randint(1, 100000)
+        heights.append(height)
+    
+    tiles = [(xs[0], 0)]
+    for k, height in enumerate(heights):
+        tiles.append((xs[k], height))
+        tiles.append((xs[k + 1], height))
+    tiles.append((xs[-1], 0))
+    return [f"{x},{y}" for x, y in tiles]
+
+
+def bench(data):
+    """Benchmark hook for `python run.py 9 --bench`."""
+    return {
+        'part1': lambda: solve_part1(data),
+        'part2': lambda: solve_part2(data),
+    }
+
+
 def main():
     """Main entry point for Day 9 solution."""
     # Example test data
@@ -12,6 +12,26 @@ from itertools import combinations
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.input_reader import read_input
+from utils.instrument import count, span
+from utils.parallel import map_reduce
+
+
+class Machine:
+    """
+    Parsed machine with the fields both parts need precomputed.
+    
+    Lights and buttons are also stored as bitmasks (bit i = light i), so
+    toggling is a single XOR in Part 1.
+    """
+    
+    __slots__ = ('target', 'buttons', 'joltage', 'target_mask', 'button_masks')
+    
+    def __init__(self, target, buttons, joltage):
+        self.target = tuple(target)
+        self.buttons = tuple(tuple(button) for button in buttons)
+        self.joltage = tuple(joltage)
+        self.target_mask = sum(1 << i for i, on in enumerate(self.target) if on)
+        self.button_masks = tuple(sum(1 << i for i in button) for button in self.buttons)
 
 
 def parse_machine(line):
@@ -26,26 +46,33 @@ def parse_machine(line):
     joltage_match = re.search(r'\{([0-9,]+)\}', line)
     joltage = [int(x) for x in joltage_match.group(1).split(',')]
     
-    return target, buttons, joltage
+    return Machine(target, buttons, joltage)
+
+
+def parse(data):
+    """Parse input lines into Machines (already parsed records pass through)."""
+    return [line if isinstance(line, Machine) else parse_machine(line) for line in data]
 
 
-def solve_part1_machine(target, buttons):
+def solve_part1_machine(machine):
     """Solve Part 1 - toggle lights."""
-    for size in range(len(buttons) + 1):
-        for combo in combinations(range(len(buttons)), size):
-            state = [0] * len(target)
-            for button_idx in combo:
-                for light_idx in buttons[button_idx]:
-                    state[light_idx] ^= 1
-            if state == target:
+    masks = machine.button_masks
+    for size in range(len(masks) + 1):
+        for combo in combinations(masks, size):
+            state = 0
+            for mask in combo:
+                state ^= mask
+            if state == machine.target_mask:
                 return size
     return 0
 
 
-def solve_part2_machine(joltage, buttons):
+def solve_part2_machine(machine):
     """Solve Part 2 - ILP to find minimum button presses."""
     import pulp
     
+    buttons = machine.buttons
+    joltage = machine.joltage
     n_buttons = len(buttons)
     n_counters = len(joltage)
     
@@ -70,27 +97,21 @@ def solve_part2_machine(joltage, buttons):
             prob += pulp.lpSum(b[j] for j in constraints[i]) == joltage[i]
     
     # Solve
-    prob.solve(pulp.PULP_CBC_CMD(msg=0))
+    count('CBC calls')
+    with span('CBC solve'):
+        prob.solve(pulp.PULP_CBC_CMD(msg=0))
     
     return int(pulp.value(prob.objective)) if prob.status == pulp.LpStatusOptimal else 0
 
 
 def solve_part1(data):
     """Part 1: Toggle lights."""
-    total = 0
-    for line in data:
-        target, buttons, _ = parse_machine(line)
-        total += solve_part1_machine(target, buttons)
-    return total
+    return map_reduce(parse(data), solve_part1_machine)
 
 
 def solve_part2(data):
     """Part 2: Joltage configuration."""
-    total = 0
-    for line in data:
-        _, buttons, joltage = parse_machine(line)
-        total += solve_part2_machine(joltage, buttons)
-    return total
+    return map_reduce(parse(data), solve_part2_machine)
 
 
 def main():
@@ -102,14 +123,15 @@ def main():
     ]
     
     print("=== Day 10: Factory ===\n")
+    example_machines = parse(example_data)
     print("Testing with example:")
-    print(f"  Part 1: {solve_part1(example_data)} (expected: 7)")
-    print(f"  Part 2: {solve_part2(example_data)} (expected: 33)")
+    print(f"  Part 1: {solve_part1(example_machines)} (expected: 7)")
+    print(f"  Part 2: {solve_part2(example_machines)} (expected: 33)")
     print()
     
     input_file = os.path.join(os.path.dirname(__file__), 'input.txt')
     try:
-        data = read_input(input_file)
+        data = parse(read_input(input_file))
         print("Puzzle answers:")
         print(f"  Part 1: {solve_part1(data)}")
         print(f"  Part 2: {solve_part2(data)}")
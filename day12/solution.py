@@ -6,10 +6,35 @@ Uses Google OR-Tools CP-SAT solver for constraint satisfaction.
 
 import os
 import sys
+from functools import partial
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.input_reader import read_input_raw
+from utils.instrument import count, span
+from utils.parallel import map_reduce
 from ortools.sat.python import cp_model
 
+class Shape:
+    """Present shape with its cell count and distinct orientations precomputed."""
+    
+    __slots__ = ('index', 'rows', 'cell_count', 'orientations')
+    
+    def __init__(self, index, rows):
+        self.index = index
+        self.rows = tuple(rows)
+        self.orientations = get_all_orientations(self.rows)
+        self.cell_count = len(self.orientations[0]) if self.orientations else 0
+
+class Region:
+    """Region under a tree: dimensions, present counts and area."""
+    
+    __slots__ = ('width', 'height', 'present_counts', 'area')
+    
+    def __init__(self, width, height, present_counts):
+        self.width = width
+        self.height = height
+        self.present_counts = tuple(present_counts)
+        self.area = width * height
+
 def parse_input(data):
     sections = data.strip().split('\n\n')
     shapes = {}
@@ -20,7 +45,7 @@ def parse_input(data):
         first_line = lines[0].strip()
         if first_line and first_line[-1] == ':' and first_line[:-1].isdigit():
             idx = int(first_line[:-1])
-            shapes[idx] = [list(line) for line in lines[1:]]
+            shapes[idx] = Shape(idx, lines[1:])
             section_idx = i + 1
         else:
             section_idx = i
@@ -35,7 +60,7 @@ def parse_input(data):
             dims, counts = line.split(': ')
             w, h = map(int, dims.split('x'))
             present_counts = list(map(int, counts.split()))
-            regions.append((w, h, present_counts))
+            regions.append(Region(w, h, present_counts))
     
     return shapes, regions
 
@@ -81,9 +106,11 @@ def can_fit_cpsat(w, h, presents, all_orientations, time_limit=3):
         
         # Need significant slack for many pieces
         required_slack = 0.15 + (len(presents) - 80) * 0.001
+        count('slack heuristic decisions')
         return slack_ratio >= required_slack
     
     model = cp_model.CpModel()
+    count('CP-SAT models built')
     
     # Generate placements but LIMIT the number per present to avoid explosion
     MAX_PLACEMENTS_PER_PRESENT = 200
@@ -138,43 +165,40 @@ def can_fit_cpsat(w, h, presents, all_orientations, time_limit=3):
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = time_limit
     solver.parameters.log_search_progress = False
-    status = solver.Solve(model)
+    with span('CP-SAT solve'):
+        status = solver.Solve(model)
     
     return status in [cp_model.OPTIMAL, cp_model.FEASIBLE]
 
+def check_region(all_orientations, shape_sizes, region):
+    """Return (fits, checked) for one region, each 0 or 1."""
+    # Only filter: Space check (your optimization)
+    total_cells_needed = sum(shape_sizes[idx] * cnt for idx, cnt in enumerate(region.present_counts))
+    if total_cells_needed > region.area:
+        return 0, 0
+    
+    presents = [idx for idx, cnt in enumerate(region.present_counts) for _ in range(cnt)]
+    fits = can_fit_cpsat(region.width, region.height, presents, all_orientations, time_limit=1)
+    return int(fits), 1
+
+def add_pairs(a, b):
+    return a[0] + b[0], a[1] + b[1]
+
 def solve_part1(data):
     shapes, regions = parse_input(data)
-    all_orientations = {idx: get_all_orientations(shape) for idx, shape in shapes.items()}
-    shape_sizes = {idx: len(all_orientations[idx][0]) for idx in shapes}
+    all_orientations = {idx: shape.orientations for idx, shape in shapes.items()}
+    shape_sizes = {idx: shape.cell_count for idx, shape in shapes.items()}
     
     print(f"  Total regions to check: {len(regions)}")
     
-    count = 0
-    skipped_space = 0
-    checked = 0
-    
-    for w, h, present_counts in regions:
-        area = w * h
-        
-        # Only filter: Space check (your optimization)
-        total_cells_needed = sum(shape_sizes[idx] * cnt for idx, cnt in enumerate(present_counts))
-        if total_cells_needed > area:
-            skipped_space += 1
-            continue
-        
-        checked += 1
-        presents = [idx for idx, cnt in enumerate(present_counts) for _ in range(cnt)]
-        
-        if can_fit_cpsat(w, h, presents, all_orientations, time_limit=1):
-            count += 1
-        
-        # Progress
-        if checked % 20 == 0:
-            print(f"    Progress: checked {checked}, found {count} fits...")
+    # Regions are independent, so they can be fanned out over worker processes
+    found, checked = map_reduce(regions, partial(check_region, all_orientations, shape_sizes),
+                                reducer=add_pairs, initial=(0, 0))
+    skipped_space = len(regions) - checked
     
     print(f"  Skipped: {skipped_space} (space)")
-    print(f"  Checked: {checked}, Found: {count}")
-    return count
+    print(f"  Checked: {checked}, Found: {found}")
+    return found
 
 def solve_part2(data):
     pass
@@ -44,6 +44,7 @@ def create_new_day(day_num):
             content = f.read()
         
         content = content.replace('Day XX', f'Day {day_num}')
+        content = content.replace('run.py XX', f'run.py {day_num}')
         
         with open(solution_file, 'w') as f:
             f.write(content)
@@ -71,7 +72,7 @@ def create_new_day(day_num):
 
 [Any notes or observations about the puzzle]
 """
-    
+
     with open(readme_file, 'w') as f:
         f.write(readme_content)
     
@@ -79,8 +80,9 @@ def create_new_day(day_num):
     print(f"\nDay {day_num} setup complete!")
     print(f"\nNext steps:")
     print(f"1. Add your puzzle input to: {input_file}")
-    print(f"2. Implement your solution in: {solution_file}")
+    print(f"2. Fill in EXAMPLE, parse() and the parts in: {solution_file}")
     print(f"3. Run with: python run.py {day_num}")
+    print(f"4. Benchmark with: python run.py {day_num} --bench")
     
     return True
 
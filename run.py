@@ -2,13 +2,23 @@
 Advent of Code 2025 - Main Runner
 
 Run solutions for specific days or all days.
+
+Usage:
+    python run.py [day|all] [--backend pure|numpy|bitboard] [--jobs N]
+    python run.py <day|all> --bench [--repeat N] [--size N] [--backend pure|numpy|bitboard]
 """
 
 import os
 import sys
+import argparse
+import timeit
 import importlib.util
 from pathlib import Path
 
+from utils import instrument
+from utils.backend import BACKENDS, available_backends, is_available, use_backend
+from utils.input_reader import read_input
+
 
 def get_day_directories():
     """Get all day directories in sorted order."""
@@ -22,36 +32,155 @@ def get_day_directories():
     return sorted(day_dirs, key=lambda x: int(x.name[3:]))
 
 
-def run_day(day_num):
+def load_day(day_num):
     """
-    Run the solution for a specific day.
+    Import the solution module for a specific day.
     
     Args:
         day_num: Day number (1-25)
+    
+    Returns:
+        The loaded module, or None if the day has no solution file
     """
     day_dir = Path(__file__).parent / f"day{day_num:02d}"
     solution_file = day_dir / "solution.py"
     
     if not solution_file.exists():
         print(f"Day {day_num} solution not found.")
-        return False
+        return None
     
-    # Import and run the solution
     spec = importlib.util.spec_from_file_location(f"day{day_num:02d}", solution_file)
     module = importlib.util.module_from_spec(spec)
     sys.modules[f"day{day_num:02d}"] = module
     spec.loader.exec_module(module)
+    return module
+
+
+def run_day(day_num, backend='pure'):
+    """
+    Run the solution for a specific day.
+    
+    Args:
+        day_num: Day number (1-25)
+        backend: Backend whose part implementations to use (default 'pure')
+    """
+    module = load_day(day_num)
+    if module is None:
+        return False
     
     if hasattr(module, 'main'):
+        if backend != 'pure':
+            used = use_backend(module, backend)
+            print("Backend: " + ", ".join(f"{part} {name}" for part, name in used.items()))
+        
+        # Attribute counters and spans to the part that recorded them
+        for attr, label in (('solve_part1', 'Part 1'), ('solve_part2', 'Part 2')):
+            if hasattr(module, attr):
+                setattr(module, attr, instrument.scoped(label, getattr(module, attr)))
+        
+        instrument.reset()
         module.main()
+        
+        if instrument.ENABLED:
+            report = instrument.format_report()
+            if report:
+                print("\nInstrumentation:")
+                print(report)
         return True
     else:
         print(f"No main() function found in day {day_num} solution.")
         return False
 
 
-def run_all_days():
-    """Run solutions for all available days."""
+def bench_input(module, day_num, size=None):
+    """
+    Pick the input lines to benchmark a day with.
+    
+    Uses generate(size) when a size is given, otherwise the real input.txt,
+    falling back to the module's EXAMPLE.
+    
+    Args:
+        module: Loaded solution module
+        day_num: Day number (1-25)
+        size: Optional synthetic input size passed to generate()
+    
+    Returns:
+        Tuple of (description, lines), or (None, None) if no input is available
+    """
+    if size is not None:
+        if not hasattr(module, 'generate'):
+            return None, None
+        return f"generated (size {size})", module.generate(size)
+    
+    input_file = Path(__file__).parent / f"day{day_num:02d}" / "input.txt"
+    if input_file.exists():
+        lines = read_input(input_file)
+        if lines:
+            return "input.txt", lines
+    
+    if getattr(module, 'EXAMPLE', None):
+        return "example", module.EXAMPLE
+    
+    return None, None
+
+
+def bench_day(day_num, repeat=5, size=None, backend=None):
+    """
+    Time each stage returned by a day's bench() hook.
+    
+    Every backend the day registers (and can run here) is timed and shown
+    side by side, unless a single backend is requested.
+    
+    Args:
+        day_num: Day number (1-25)
+        repeat: Number of timed runs per stage
+        size: Optional synthetic input size passed to generate()
+        backend: Only time this backend (default: all available)
+    """
+    module = load_day(day_num)
+    if module is None:
+        return False
+    
+    if not hasattr(module, 'bench'):
+        print(f"Day {day_num} has no bench() hook.")
+        return False
+    
+    try:
+        source, lines = bench_input(module, day_num, size)
+    except NotImplementedError as e:
+        print(f"Day {day_num}: {e}")
+        return False
+    
+    if lines is None:
+        print(f"Day {day_num}: no input to benchmark with.")
+        return False
+    
+    backends = [backend] if backend else available_backends(module)
+    
+    # stage -> backend -> best time in seconds
+    results = {}
+    for name in backends:
+        use_backend(module, name)
+        for stage, func in module.bench(lines).items():
+            times = timeit.repeat(func, number=1, repeat=repeat)
+            results.setdefault(stage, {})[name] = min(times)
+    use_backend(module, 'pure')
+    
+    print(f"=== Day {day_num} benchmark: {source}, best of {repeat} (ms) ===")
+    print(f"  {'stage':<12}" + "".join(f"{name:>14}" for name in backends))
+    for stage, timings in results.items():
+        print(f"  {stage:<12}" + "".join(f"{timings[name] * 1000:>14.3f}" for name in backends))
+    return True
+
+
+def run_all_days(runner=run_day, **kwargs):
+    """
+    Run solutions for all available days.
+    
+    Args:
+        runner: Per-day function to call (run_day or bench_day)
+        **kwargs: Extra arguments passed to the runner
+    """
     day_dirs = get_day_directories()
     
     if not day_dirs:
@@ -61,27 +190,55 @@ def run_all_days():
     for day_dir in day_dirs:
         day_num = int(day_dir.name[3:])
         print(f"\n{'=' * 60}")
-        run_day(day_num)
+        runner(day_num, **kwargs)
         print('=' * 60)
 
 
 def main():
     """Main entry point."""
-    if len(sys.argv) > 1:
-        try:
-            day_num = int(sys.argv[1])
-            if 1 <= day_num <= 25:
-                run_day(day_num)
-            else:
-                print("Day number must be between 1 and 25.")
-        except ValueError:
-            if sys.argv[1].lower() == 'all':
-                run_all_days()
-            else:
-                print("Invalid argument. Use a day number (1-25) or 'all'.")
+    parser = argparse.ArgumentParser(description="Run Advent of Code 2025 solutions.")
+    parser.add_argument('day', nargs='?', default='all',
+                        help="Day number (1-25) or 'all' (default)")
+    parser.add_argument('--bench', action='store_true',
+                        help="Time the stages of each day's bench() hook instead of running main()")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="Timed runs per stage in bench mode (default 5)")
+    parser.add_argument('--size', type=int, default=None,
+                        help="Benchmark on generate(SIZE) instead of input.txt")
+    parser.add_argument('--backend', choices=BACKENDS, default=None,
+                        help="Part implementations to use (default pure; bench mode compares all)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Worker processes for days that fan out per record (default 1)")
+    args = parser.parse_args()
+    
+    if args.jobs is not None:
+        # Read by utils.parallel.map_reduce
+        os.environ['AOC_JOBS'] = str(args.jobs)
+    
+    backend = args.backend
+    if backend and not is_available(backend):
+        print(f"Backend '{backend}' is not installed; using the pure backend.")
+        backend = 'pure'
+    
+    if args.bench:
+        runner, kwargs = bench_day, {'repeat': args.repeat, 'size': args.size, 'backend': backend}
+    else:
+        runner, kwargs = run_day, {'backend': backend or 'pure'}
+    
+    if args.day.lower() == 'all':
+        run_all_days(runner, **kwargs)
+        return
+    
+    try:
+        day_num = int(args.day)
+    except ValueError:
+        print("Invalid argument. Use a day number (1-25) or 'all'.")
+        return
+    
+    if 1 <= day_num <= 25:
+        runner(day_num, **kwargs)
     else:
-        # No arguments - run all days
-        run_all_days()
+        print("Day number must be between 1 and 25.")
 
 
 if __name__ == "__main__":
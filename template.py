@@ -13,12 +13,34 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.input_reader import read_input
 
 
+# Example input from the puzzle description and its expected answers
+EXAMPLE = [
+    # TODO: Add example input lines
+]
+EXAMPLE_PART1 = None  # TODO: Expected answer for part 1
+EXAMPLE_PART2 = None  # TODO: Expected answer for part 2
+
+
+def parse(lines):
+    """
+    Parse the raw input lines into the structure both parts work on.
+    
+    Args:
+        lines: List of non-empty input lines
+    
+    Returns:
+        Parsed puzzle data
+    """
+    # TODO: Parse the input once so the parts only do the solving
+    return lines
+
+
 def solve_part1(data):
     """
     Part 1: [DESCRIPTION]
     
     Args:
-        data: Puzzle input data
+        data: Parsed puzzle data (see parse())
     
     Returns:
         Solution for part 1
@@ -32,7 +54,7 @@ def solve_part2(data):
     Part 2: [DESCRIPTION]
     
     Args:
-        data: Puzzle input data
+        data: Parsed puzzle data (see parse())
     
     Returns:
         Solution for part 2
@@ -41,40 +63,61 @@ def solve_part2(data):
     pass
 
 
+def generate(size, seed=0):
+    """
+    Generate a synthetic puzzle input for benchmarking.
+    
+    Args:
+        size: Rough number of records to generate
+        seed: Random seed, so repeated runs time the same input
+    
+    Returns:
+        List of input lines in the same format as input.txt
+    """
+    # TODO: Build random lines matching the input format
+    raise NotImplementedError("no input generator implemented yet")
+
+
+def bench(lines):
+    """
+    Benchmark hook used by `python run.py XX --bench`.
+    
+    Args:
+        lines: Raw input lines (real input, example, or generate() output)
+    
+    Returns:
+        Dict of stage name -> zero-argument callable to time
+    """
+    data = parse(lines)
+    return {
+        'parse': lambda: parse(lines),
+        'part1': lambda: solve_part1(data),
+        'part2': lambda: solve_part2(data),
+    }
+
+
 def main():
     """Main entry point for Day XX solution."""
-    # Example test data
-    example_data = [
-        # TODO: Add example input
-    ]
-    
-    # Test with example
     print("=== Day XX: [PUZZLE TITLE] ===\n")
     
-    if example_data:
+    # Test with example
+    if EXAMPLE:
+        example = parse(EXAMPLE)
         print("Testing with example:")
-        example_part1 = solve_part1(example_data)
-        print(f"  Part 1: {example_part1} (expected: [EXPECTED])")
-        
-        # Uncomment when part 2 is available
-        # example_part2 = solve_part2(example_data)
-        # print(f"  Part 2: {example_part2} (expected: [EXPECTED])")
+        print(f"  Part 1: {solve_part1(example)} (expected: {EXAMPLE_PART1})")
+        print(f"  Part 2: {solve_part2(example)} (expected: {EXAMPLE_PART2})")
         print()
     
     # Solve actual puzzle
     input_file = os.path.join(os.path.dirname(__file__), 'input.txt')
     
     try:
-        data = read_input(input_file)
+        data = parse(read_input(input_file))
         
-        part1_answer = solve_part1(data)
         print("Puzzle answers:")
-        print(f"  Part 1: {part1_answer}")
-        
-        # Uncomment when part 2 is available
-        # part2_answer = solve_part2(data)
-        # print(f"  Part 2: {part2_answer}")
-        
+        print(f"  Part 1: {solve_part1(data)}")
+        print(f"  Part 2: {solve_part2(data)}")
+    
     except FileNotFoundError:
         print(f"Input file not found: {input_file}")
         print("Please add your puzzle input to solve the actual puzzle.")
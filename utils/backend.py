@@ -0,0 +1,111 @@
+"""
+Optional alternative backends for solver parts.
+
+Every day's plain ``solve_part1``/``solve_part2`` is the ``pure`` backend.
+A day can register extra implementations of a part under another backend
+name (``numpy``, or ``bitboard`` for pure-Python bit-parallel engines); the
+runner swaps them in with ``python run.py <day> --backend numpy``. NumPy is
+optional: when it is not installed, numpy registrations are ignored and the
+pure path is used.
+
+Usage:
+    from utils.backend import np, register
+
+    @register('numpy', 'part1')
+    def solve_part1_numpy(data):
+        ...
+"""
+
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+HAVE_NUMPY = np is not None
+BACKENDS = ('pure', 'numpy', 'bitboard')
+PARTS = ('part1', 'part2')
+
+
+def register(backend, part):
+    """
+    Decorator registering a function as a backend implementation of a part.
+
+    The function is recorded in the ``BACKENDS`` dict of the module that
+    defines it and is returned unchanged.
+
+    Args:
+        backend: Backend name (e.g. 'numpy' or 'bitboard')
+        part: 'part1' or 'part2'
+
+    Returns:
+        Decorator
+    """
+    if backend not in BACKENDS or backend == 'pure':
+        raise ValueError(f"Unknown backend: {backend}")
+    if part not in PARTS:
+        raise ValueError(f"Unknown part: {part}")
+
+    def decorator(func):
+        module = sys.modules[func.__module__]
+        registry = module.__dict__.setdefault('BACKENDS', {})
+        registry.setdefault(backend, {})[part] = func
+        return func
+
+    return decorator
+
+
+def is_available(backend):
+    """Return True if the backend's dependencies are installed."""
+    if backend == 'numpy':
+        return HAVE_NUMPY
+    return backend in BACKENDS
+
+
+def available_backends(module):
+    """
+    List the backends a day module can actually run with.
+
+    Args:
+        module: Loaded solution module
+
+    Returns:
+        List of backend names, always starting with 'pure'
+    """
+    registry = getattr(module, 'BACKENDS', {})
+    return ['pure'] + [name for name in BACKENDS[1:]
+                       if name in registry and is_available(name)]
+
+
+def use_backend(module, backend):
+    """
+    Rebind a day module's solve_part1/solve_part2 to a backend.
+
+    Parts without a registration for the backend (or all parts, when the
+    backend's dependencies are missing) keep the pure implementation. The
+    pure functions are remembered, so switching back to 'pure' works.
+
+    Args:
+        module: Loaded solution module
+        backend: Backend name
+
+    Returns:
+        Dict mapping part -> backend name actually used
+    """
+    pure = module.__dict__.setdefault('_PURE_PARTS', {
+        part: getattr(module, f'solve_{part}')
+        for part in PARTS if hasattr(module, f'solve_{part}')
+    })
+    registry = getattr(module, 'BACKENDS', {}).get(backend, {})
+
+    used = {}
+    for part, func in pure.items():
+        if backend != 'pure' and is_available(backend) and part in registry:
+            setattr(module, f'solve_{part}', registry[part])
+            used[part] = backend
+        else:
+            setattr(module, f'solve_{part}', func)
+            used[part] = 'pure'
+    return used
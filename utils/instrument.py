@@ -0,0 +1,203 @@
+"""
+Lightweight counters and timed spans for solver hot paths.
+
+Solvers annotate interesting work with ``count()`` and ``span()``; the runner
+aggregates the results per part and prints them after the day finishes.
+
+Instrumentation is controlled by the ``AOC_INSTRUMENT`` environment variable,
+read once at import time. When it is unset (or ``0``), ``count`` and ``span``
+are bound to no-op implementations, so an annotated solver only pays for a
+plain function call. Hot loops should accumulate into a local variable and
+report it with a single ``count(name, n)`` call after the loop.
+
+Usage:
+    from utils.instrument import count, span
+
+    with span('build model'):
+        ...
+    count('models built')
+"""
+
+import os
+import time
+from collections import defaultdict
+from functools import wraps
+
+
+ENABLED = os.environ.get('AOC_INSTRUMENT', '0') not in ('', '0')
+
+# scope -> name -> value
+_counters = defaultdict(lambda: defaultdict(int))
+# scope -> name -> [calls, total seconds]
+_spans = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+_scope = 'main'
+
+
+class _Span:
+    """Context manager that adds its elapsed wall time to the current scope."""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record = _spans[_scope][self.name]
+        record[0] += 1
+        record[1] += time.perf_counter() - self.start
+        return False
+
+
+class _NullSpan:
+    """Shared do-nothing context manager used when instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _count(name, n=1):
+    """
+    Add n to the counter called name in the current scope.
+
+    Args:
+        name: Counter label (e.g. 'grid sweeps')
+        n: Amount to add (default 1)
+    """
+    _counters[_scope][name] += n
+
+
+def _count_disabled(name, n=1):
+    """No-op replacement for _count when instrumentation is off."""
+
+
+def _span(name):
+    """
+    Return a context manager that times its body under the given name.
+
+    Args:
+        name: Span label (e.g. 'solve model')
+
+    Returns:
+        Context manager recording call count and total wall time
+    """
+    return _Span(name)
+
+
+def _span_disabled(name):
+    """No-op replacement for _span when instrumentation is off."""
+    return _NULL_SPAN
+
+
+if ENABLED:
+    count = _count
+    span = _span
+else:
+    count = _count_disabled
+    span = _span_disabled
+
+
+def scoped(label, func):
+    """
+    Wrap a function so everything it records is attributed to label.
+
+    The runner uses this to group counters and spans by puzzle part. When
+    instrumentation is disabled the function is returned unchanged.
+
+    Args:
+        label: Scope name (e.g. 'Part 1')
+        func: Function to wrap
+
+    Returns:
+        Wrapped function
+    """
+    if not ENABLED:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        global _scope
+        previous = _scope
+        _scope = label
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _scope = previous
+
+    return wrapper
+
+
+def reset():
+    """Discard all recorded counters and spans."""
+    _counters.clear()
+    _spans.clear()
+
+
+def snapshot():
+    """
+    Return a plain-dict copy of everything recorded so far.
+
+    Returns:
+        Dict mapping scope -> {'counters': {...}, 'spans': {name: (calls, seconds)}}
+    """
+    scopes = {}
+    for scope in list(_counters) + list(_spans):
+        scopes[scope] = {
+            'counters': dict(_counters.get(scope, {})),
+            'spans': {name: tuple(record) for name, record in _spans.get(scope, {}).items()},
+        }
+    return scopes
+
+
+def merge(stats):
+    """
+    Add counters and spans recorded elsewhere (e.g. in a worker process).
+
+    Everything in stats is attributed to the current scope, since workers
+    run on behalf of whichever part is executing in this process.
+
+    Args:
+        stats: Result of snapshot() taken in the other process
+    """
+    for recorded in stats.values():
+        for name, value in recorded['counters'].items():
+            _counters[_scope][name] += value
+        for name, (calls, seconds) in recorded['spans'].items():
+            record = _spans[_scope][name]
+            record[0] += calls
+            record[1] += seconds
+
+
+def format_report(stats=None):
+    """
+    Format recorded counters and spans as indented text, one scope per block.
+
+    Args:
+        stats: Result of snapshot() (default: current state)
+
+    Returns:
+        Report as a string (empty if nothing was recorded)
+    """
+    if stats is None:
+        stats = snapshot()
+
+    lines = []
+    for scope in sorted(stats):
+        lines.append(f"  {scope}:")
+        for name, value in sorted(stats[scope]['counters'].items()):
+            lines.append(f"    {name:<32} {value:>14,}")
+        for name, (calls, seconds) in sorted(stats[scope]['spans'].items()):
+            lines.append(f"    {name:<32} {seconds * 1000:>11.2f} ms  ({calls} calls)")
+    return '\n'.join(lines)
@@ -0,0 +1,102 @@
+"""
+Process-pool fan-out for days whose records are solved independently.
+
+``map_reduce`` applies a function to every record and folds the results with
+a reducer. Records are sent to workers in chunks (one pickle per chunk rather
+than per record), each worker reduces its own chunk, and the partial results
+are folded in chunk order, so the reduction order is deterministic.
+
+The number of worker processes defaults to the ``AOC_JOBS`` environment
+variable (set by ``python run.py <day> --jobs N``) and is 1 (serial) when it
+is unset. Small inputs always run serially. Counters and spans recorded by
+``utils.instrument`` inside workers are sent back and merged into the
+parent's current scope.
+
+Usage:
+    from utils.parallel import map_reduce
+
+    total = map_reduce(banks, solve_part1_bank)
+"""
+
+import os
+import operator
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+from utils import instrument
+
+
+def default_jobs():
+    """Return the worker count configured via AOC_JOBS (default 1)."""
+    try:
+        return max(1, int(os.environ.get('AOC_JOBS', '1')))
+    except ValueError:
+        return 1
+
+
+def _reduce_chunk(fn, reducer, initial, chunk):
+    """
+    Worker: map fn over one chunk and reduce it to a single partial result.
+
+    Returns the partial result together with the instrumentation recorded
+    while computing it (None when instrumentation is off), so the parent
+    can merge counters and spans that would otherwise stay in the worker.
+    """
+    if not instrument.ENABLED:
+        return reduce(reducer, map(fn, chunk), initial), None
+
+    # Drop whatever the forked worker inherited or recorded for earlier chunks
+    instrument.reset()
+    result = reduce(reducer, map(fn, chunk), initial)
+    return result, instrument.snapshot()
+
+
+def map_reduce(records, fn, reducer=operator.add, initial=0, jobs=None,
+               chunksize=None, serial_below=64):
+    """
+    Apply fn to every record and combine the results with reducer.
+
+    fn and reducer must be picklable (module-level functions or
+    functools.partial of them), reducer must be associative, and initial
+    must be its identity, since each chunk is reduced separately before the
+    partial results are combined.
+
+    Args:
+        records: Iterable of independent records
+        fn: Function applied to each record
+        reducer: Binary function combining results (default: addition)
+        initial: Identity value for reducer (default 0)
+        jobs: Worker processes (default: default_jobs())
+        chunksize: Records per task (default: about 4 tasks per worker)
+        serial_below: Inputs with fewer records run serially (default 64)
+
+    Returns:
+        The reduced result, identical to the serial fold
+    """
+    records = list(records)
+    jobs = default_jobs() if jobs is None else jobs
+
+    if jobs <= 1 or len(records) < max(serial_below, 2):
+        return reduce(reducer, map(fn, records), initial)
+
+    # Workers inherit the already-imported day module, so only fork works
+    # for solution modules loaded from a file path
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return reduce(reducer, map(fn, records), initial)
+
+    if chunksize is None:
+        chunksize = max(1, -(-len(records) // (jobs * 4)))
+    chunks = [records[i:i + chunksize] for i in range(0, len(records), chunksize)]
+
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)), mp_context=context) as pool:
+        result = initial
+        results = pool.map(_reduce_chunk,
+                           [fn] * len(chunks), [reducer] * len(chunks),
+                           [initial] * len(chunks), chunks)
+        for chunk_result, stats in results:
+            result = reducer(result, chunk_result)
+            if stats:
+                instrument.merge(stats)
+        return result